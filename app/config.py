@@ -1,21 +1,36 @@
 """
-Application configuration using pydantic-settings.
+Application configuration using msgspec.
 
 This module provides type-safe, validated configuration management
-with support for environment variables and .env files.
+with support for environment variables and .env files. Settings are a
+frozen ``msgspec.Struct``, which is much cheaper to import and build
+than pydantic-settings.
 """
 
-from pydantic_settings import BaseSettings
-from typing import List
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, get_origin
+import logging
+import os
 
+import msgspec
+from dotenv import dotenv_values
 
-class Settings(BaseSettings):
+
+ENV_FILE = ".env"
+"""Optional dotenv file read in addition to the process environment"""
+
+
+class Settings(msgspec.Struct, frozen=True, dict=True):
     """
     Application settings with validation.
     
     All settings can be overridden via environment variables.
     For example, CLICKHOUSE_HOST environment variable will override
-    the default value.
+    the default value. Use ``load_settings()`` to build an instance from
+    the environment; ``Settings()`` alone only applies the defaults.
+    
+    ``dict=True`` gives instances a ``__dict__`` so the derived values
+    below can be ``cached_property`` despite the struct being frozen.
     """
     
     # ========================================================================
@@ -55,6 +70,12 @@ class Settings(BaseSettings):
     POOL_RECYCLE: int = 3600
     """Recycle connections after this many seconds (default: 1 hour)"""
     
+    POOL_IDLE_TIMEOUT: float = 10.0
+    """Close pooled connections idle this long (below server keep_alive_timeout)"""
+    
+    CONNECT_FAILURE_COOLDOWN: float = 1.0
+    """Seconds to fail fast after a failed connection attempt before retrying"""
+    
     # ========================================================================
     # Query Settings
     # ========================================================================
@@ -68,6 +89,18 @@ class Settings(BaseSettings):
     QUERY_TIMEOUT: int = 30
     """Query execution timeout in seconds"""
     
+    LATEST_CACHE_TTL: float = 1.0
+    """Seconds a /latest response is reused per symbol (0 disables caching)"""
+    
+    LATEST_CACHE_SIZE: int = 4096
+    """Maximum number of symbols kept in the /latest response cache"""
+    
+    HEALTH_CHECK_INTERVAL: float = 5.0
+    """Seconds between background database pings used by the health endpoints"""
+    
+    HEALTH_CHECK_TIMEOUT: float = 1.0
+    """Seconds a health-check database ping may take before it counts as down"""
+    
     # ========================================================================
     # API Settings
     # ========================================================================
@@ -75,7 +108,7 @@ class Settings(BaseSettings):
     API_PREFIX: str = "/api/v1"
     """URL prefix for API endpoints"""
     
-    CORS_ORIGINS: List[str] = ["*"]
+    CORS_ORIGINS: List[str] = msgspec.field(default_factory=lambda: ["*"])
     """Allowed CORS origins"""
     
     # ========================================================================
@@ -98,16 +131,10 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = False
     """Enable rate limiting (Phase 5)"""
     
-    class Config:
-        """Pydantic settings configuration."""
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-        extra = "ignore"  # Ignore extra fields in .env
-    
-    def get_clickhouse_url(self) -> str:
+    @cached_property
+    def clickhouse_url(self) -> str:
         """
-        Build ClickHouse connection URL.
+        ClickHouse connection URL (computed once).
         
         Returns:
             Connection URL string
@@ -115,14 +142,73 @@ class Settings(BaseSettings):
         protocol = "https" if self.CLICKHOUSE_SECURE else "http"
         return f"{protocol}://{self.CLICKHOUSE_HOST}:{self.CLICKHOUSE_PORT}"
     
+    def get_clickhouse_url(self) -> str:
+        """Build ClickHouse connection URL (kept for backward compatibility)."""
+        return self.clickhouse_url
+    
+    @cached_property
     def is_production(self) -> bool:
-        """Check if running in production environment."""
+        """Whether running in production environment (computed once)."""
         return self.ENVIRONMENT == "production"
     
+    @cached_property
     def is_development(self) -> bool:
-        """Check if running in development environment."""
+        """Whether running in development environment (computed once)."""
         return self.ENVIRONMENT == "development"
+    
+    @cached_property
+    def log_level_int(self) -> int:
+        """Numeric logging level for LOG_LEVEL (computed once)."""
+        return logging.getLevelNamesMapping()[self.LOG_LEVEL.upper()]
+
+
+def load_settings(env_file: str = ENV_FILE) -> Settings:
+    """
+    Build settings from the .env file and environment variables.
+    
+    Environment variables take precedence over the .env file. Names are
+    case-sensitive and unknown keys are ignored. List-valued settings
+    (e.g. CORS_ORIGINS) are given as JSON arrays.
+    
+    Args:
+        env_file: Path to the dotenv file (missing file is not an error)
+        
+    Returns:
+        Validated Settings instance
+        
+    Raises:
+        msgspec.ValidationError: If a value cannot be converted
+    """
+    raw = {**dotenv_values(env_file), **os.environ}
+    values: Dict[str, Any] = {}
+    
+    for field in msgspec.structs.fields(Settings):
+        value = raw.get(field.name)
+        if value is None:
+            continue
+        if get_origin(field.type) is list:
+            value = msgspec.json.decode(value)
+        values[field.name] = value
+    
+    return msgspec.convert(values, Settings, strict=False)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings, constructing them on first use.
+    
+    Environment variables and the .env file are only read once; call
+    ``get_settings.cache_clear()`` to force a reload (e.g. in tests).
+    
+    Returns:
+        Cached Settings instance
+    """
+    return load_settings()
 
 
-# Create global settings instance
-settings = Settings()
+def __getattr__(name: str):
+    """Backward-compatible lazy access to the global ``settings`` instance."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
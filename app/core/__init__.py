@@ -5,9 +5,12 @@ This module includes:
 - database: ClickHouse connection management
 - exceptions: Custom exception hierarchy
 - logging_config: Structured logging (Phase 2)
+- responses: orjson-backed JSON response
+
+``ClickHouseManager`` is resolved lazily (PEP 562) so that importing
+``app.core.exceptions`` does not pull in the database layer.
 """
 
-from app.core.database import ClickHouseManager
 from app.core.exceptions import (
     BaseAPIException,
     DatabaseException,
@@ -37,3 +40,11 @@ __all__ = [
     "ResourceNotFoundException",
     "DataNotFoundError",
 ]
+
+
+def __getattr__(name: str):
+    """Lazily import the database manager on first access."""
+    if name == "ClickHouseManager":
+        from app.core.database import ClickHouseManager
+        return ClickHouseManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,19 @@
 """
 ClickHouse database connection management with async support.
 
-This module provides a singleton manager for ClickHouse connections,
-handling connection pooling, async query execution, and error handling.
+This module provides a manager for ClickHouse connections, handling
+connection pooling, async query execution, and error handling. A single
+shared instance is obtained through ``get_clickhouse_manager()``.
 """
 
-import clickhouse_connect
-from clickhouse_connect.driver.client import Client
-from typing import Optional, Any, Dict
-import time
+from functools import lru_cache
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import logging
+import re
+from typing import TYPE_CHECKING, Optional, Any, Dict, Final
+import time
 
-from app.config import settings
+from app.config import get_settings
 from app.core.exceptions import (
     ConnectionError,
     QueryError,
@@ -20,78 +21,208 @@ from app.core.exceptions import (
 )
 from app.core.logging_config import logger, log_database_query
 
+# clickhouse_connect (and its HTTP stack) is imported on first connect
+if TYPE_CHECKING:
+    import pyarrow
+    from clickhouse_connect.driver.client import Client
+    from clickhouse_connect.driver.asyncclient import AsyncClient
+
+
+# Maximum length of the parameters preview attached to query errors (DEBUG only)
+_MAX_PARAMETERS_PREVIEW = 256
+
+# Case-insensitive marker identifying driver errors caused by timeouts
+_TIMEOUT_RE = re.compile(r"timeout", re.IGNORECASE)
+
+# Query formats passed to every SELECT (shared instead of rebuilt per call)
+_NATIVE_FORMAT: Final[Dict[str, str]] = {'default': 'Native'}
+
 
 class ClickHouseManager:
     """
-    Singleton manager for ClickHouse database connections with async support.
+    Manager for ClickHouse database connections with async support.
     
     This class handles:
     - Connection lifecycle management
-    - Async query execution with thread pool
+    - Native async query execution (no thread pool)
     - Connection health checks
     - Graceful shutdown
     
+    The async methods use clickhouse-connect's native async client, so
+    concurrency scales with the event loop instead of a fixed number of
+    worker threads. The synchronous methods are kept for legacy callers.
+    
     Usage:
-        db = ClickHouseManager()
+        db = get_clickhouse_manager()
         result = await db.execute_query_async(query, parameters)
     """
     
-    _instance: Optional['ClickHouseManager'] = None
-    _client: Optional[Client] = None
-    _executor: Optional[ThreadPoolExecutor] = None
+    def __init__(self):
+        """Initialize the manager without connecting."""
+        settings = get_settings()
+        self._client: Optional['Client'] = None
+        self._async_client: Optional['AsyncClient'] = None
+        # Serializes async client creation so a burst of requests on a cold
+        # manager builds one client instead of one each
+        self._async_connect_lock = asyncio.Lock()
+        # Settings don't change after startup, so connection-error details
+        # are built once and shared by every failed connection attempt.
+        self._conn_details: Dict[str, Any] = {
+            "host": settings.CLICKHOUSE_HOST,
+            "port": settings.CLICKHOUSE_PORT,
+            "database": settings.CLICKHOUSE_DATABASE,
+        }
+        self._last_failure_ts: Optional[float] = None
+        self._last_failure_message: Optional[str] = None
+    
+    @property
+    def is_connected(self) -> bool:
+        """Whether the async client has been created."""
+        return self._async_client is not None
     
-    def __new__(cls):
-        """Singleton pattern - ensure only one instance exists."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    def _client_kwargs(self) -> Dict[str, Any]:
+        """Connection arguments shared by the sync and async clients."""
+        settings = get_settings()
+        return {
+            "host": settings.CLICKHOUSE_HOST,
+            "port": settings.CLICKHOUSE_PORT,
+            "username": settings.CLICKHOUSE_USER,
+            "password": settings.CLICKHOUSE_PASSWORD,
+            "database": settings.CLICKHOUSE_DATABASE,
+            "connect_timeout": settings.POOL_TIMEOUT,
+            "send_receive_timeout": settings.QUERY_TIMEOUT,
+        }
     
-    def __init__(self):
-        """Initialize the manager (only once due to singleton)."""
-        if not hasattr(self, '_initialized'):
-            self._initialized = True
-            self._client = None
-            self._executor = ThreadPoolExecutor(max_workers=settings.POOL_SIZE)
+    def _async_client_kwargs(self) -> Dict[str, Any]:
+        """
+        Connection arguments for the async client.
+        
+        The async client keeps a keep-alive connection pool for the life of
+        the process; it is sized from POOL_SIZE + MAX_OVERFLOW so bursts
+        reuse warm connections instead of opening new ones per request.
+        Idle connections are closed after POOL_IDLE_TIMEOUT, so stale ones
+        are dropped during quiet periods rather than failing on reuse.
+        """
+        settings = get_settings()
+        max_connections = settings.POOL_SIZE + settings.MAX_OVERFLOW
+        return {
+            **self._client_kwargs(),
+            "connector_limit": max_connections,
+            "connector_limit_per_host": max_connections,
+            "keepalive_timeout": settings.POOL_IDLE_TIMEOUT,
+        }
+    
+    def _connection_error(self, error: Exception) -> ConnectionError:
+        """Log a failed connection attempt and build the exception to raise."""
+        logger.error(f"Failed to connect to ClickHouse: {str(error)}")
+        self._last_failure_message = f"Failed to connect to ClickHouse: {str(error)}"
+        self._last_failure_ts = time.monotonic()
+        return ConnectionError(
+            message=self._last_failure_message,
+            details=self._conn_details
+        )
+    
+    def _check_circuit(self) -> None:
+        """
+        Fail fast while a recent connection failure is cooling down.
+        
+        Prevents every incoming request from re-attempting a TCP connect
+        (and waiting up to POOL_TIMEOUT) while ClickHouse is unreachable.
+        
+        Raises:
+            ConnectionError: If the last connection attempt failed less than
+                CONNECT_FAILURE_COOLDOWN seconds ago
+        """
+        if self._last_failure_ts is None:
+            return
+        
+        cooldown = get_settings().CONNECT_FAILURE_COOLDOWN
+        if time.monotonic() - self._last_failure_ts < cooldown:
+            raise ConnectionError(
+                message=self._last_failure_message,
+                details=self._conn_details
+            )
+    
+    def _reset_circuit(self) -> None:
+        """Clear the recorded connection failure after a successful connect."""
+        self._last_failure_ts = None
+        self._last_failure_message = None
     
     def connect(self) -> None:
         """
-        Establish connection to ClickHouse.
+        Establish synchronous connection to ClickHouse.
         
         Raises:
             ConnectionError: If unable to connect to database
         """
+        settings = get_settings()
         if self._client is not None:
             return  # Already connected
+        
+        self._check_circuit()
+        
+        import clickhouse_connect
             
         try:
-            self._client = clickhouse_connect.get_client(
-                host=settings.CLICKHOUSE_HOST,
-                port=settings.CLICKHOUSE_PORT,
-                username=settings.CLICKHOUSE_USER,
-                password=settings.CLICKHOUSE_PASSWORD,
-                database=settings.CLICKHOUSE_DATABASE,
-                connect_timeout=settings.POOL_TIMEOUT,
-                send_receive_timeout=settings.QUERY_TIMEOUT,
-            )
+            self._client = clickhouse_connect.get_client(**self._client_kwargs())
             
             # Test connection
             self._client.command("SELECT 1")
+            self._reset_circuit()
             logger.info(
                 f"Connected to ClickHouse at {settings.CLICKHOUSE_HOST}:{settings.CLICKHOUSE_PORT}"
             )
             
         except Exception as e:
-            logger.error(f"Failed to connect to ClickHouse: {str(e)}")
-            raise ConnectionError(
-                message=f"Failed to connect to ClickHouse: {str(e)}",
-                details={
-                    "host": settings.CLICKHOUSE_HOST,
-                    "port": settings.CLICKHOUSE_PORT,
-                    "database": settings.CLICKHOUSE_DATABASE,
-                }
+            self._client = None
+            raise self._connection_error(e)
+    
+    async def connect_async(self) -> None:
+        """
+        Establish native async connection to ClickHouse.
+        
+        Raises:
+            ConnectionError: If unable to connect to database
+        """
+        settings = get_settings()
+        if self._async_client is not None:
+            return  # Already connected
+        
+        async with self._async_connect_lock:
+            # Another task may have connected while this one waited
+            if self._async_client is not None:
+                return
+            
+            self._check_circuit()
+            
+            import clickhouse_connect
+            
+            client = None
+            try:
+                client = await clickhouse_connect.get_async_client(
+                    **self._async_client_kwargs()
+                )
+                
+                # Test connection before publishing the client
+                await client.command("SELECT 1")
+                
+            except Exception as e:
+                if client is not None:
+                    try:
+                        await client.close()
+                    except Exception as close_error:
+                        logger.warning(
+                            f"Error closing failed async connection: {close_error}"
+                        )
+                raise self._connection_error(e)
+            
+            self._async_client = client
+            self._reset_circuit()
+            logger.info(
+                f"Connected to ClickHouse (async) at {settings.CLICKHOUSE_HOST}:{settings.CLICKHOUSE_PORT}"
             )
     
-    def get_client(self) -> Client:
+    def get_client(self) -> 'Client':
         """
         Get the ClickHouse client, connecting if necessary.
         
@@ -105,6 +236,92 @@ class ClickHouseManager:
             self.connect()
         return self._client
     
+    async def get_async_client(self) -> 'AsyncClient':
+        """
+        Get the async ClickHouse client, connecting if necessary.
+        
+        Returns:
+            Async ClickHouse client instance
+            
+        Raises:
+            ConnectionError: If unable to get or create connection
+        """
+        if self._async_client is None:
+            await self.connect_async()
+        return self._async_client
+    
+    def _log_query_success(self, start_ns: int, records: int) -> None:
+        """Log a successfully executed query (skipped when INFO is disabled)."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        execution_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+        log_database_query(
+            query_type="SELECT",
+            duration_ms=round(execution_time, 2),
+            records_returned=records
+        )
+    
+    def _query_error(
+        self,
+        error: Exception,
+        query: str,
+        parameters: Dict[str, Any],
+        timeout: int,
+        start_ns: int
+    ) -> Exception:
+        """
+        Log a failed query and build the exception to raise.
+        
+        Args:
+            error: Exception raised by the ClickHouse client
+            query: SQL query that failed
+            parameters: Query parameters
+            timeout: Effective query timeout in seconds
+            start_ns: Query start time (time.perf_counter_ns())
+            
+        Returns:
+            DBTimeoutError or QueryError describing the failure
+        """
+        error_msg = str(error)
+        
+        # One payload serves both the log record and the error details
+        payload: Dict[str, Any] = {
+            "query_type": "SELECT",
+            "duration_ms": round((time.perf_counter_ns() - start_ns) / 1_000_000, 2),
+            "error": error_msg,
+        }
+        log_database_query(**payload)
+        
+        from clickhouse_connect.driver.exceptions import ClickHouseError
+        
+        if isinstance(error, ClickHouseError):
+            # Check for timeout
+            if _TIMEOUT_RE.search(error_msg) is not None:
+                return DBTimeoutError(
+                    message="Query execution timed out",
+                    timeout=timeout,
+                    details=payload
+                )
+            
+            # General query error
+            payload["parameters"] = (
+                repr(parameters)[:_MAX_PARAMETERS_PREVIEW]
+                if get_settings().DEBUG else "<omitted>"
+            )
+            return QueryError(
+                message=f"Query execution failed: {error_msg}",
+                query=query,
+                details=payload
+            )
+        
+        payload["error_type"] = type(error).__name__
+        return QueryError(
+            message=f"Unexpected error during query execution: {error_msg}",
+            query=query,
+            details=payload
+        )
+    
     def execute_query(
         self,
         query: str,
@@ -127,93 +344,44 @@ class ClickHouseManager:
             DBTimeoutError: If query times out
             ConnectionError: If connection is lost
         """
+        settings = get_settings()
         client = self.get_client()
         parameters = parameters or {}
         timeout = timeout or settings.QUERY_TIMEOUT
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             result = client.query(
                 query,
                 parameters=parameters,
-                query_formats={'default': 'Native'}
-            )
-            
-            execution_time = (time.time() - start_time) * 1000
-            
-            # Log query execution
-            log_database_query(
-                query_type="SELECT",
-                duration_ms=round(execution_time, 2),
-                records_returned=len(result.result_rows)
-            )
-            
-            return result
-            
-        except clickhouse_connect.driver.exceptions.ClickHouseError as e:
-            error_msg = str(e)
-            execution_time = (time.time() - start_time) * 1000
-            
-            # Log failed query
-            log_database_query(
-                query_type="SELECT",
-                duration_ms=round(execution_time, 2),
-                error=error_msg
+                query_formats=_NATIVE_FORMAT
             )
-            
-            # Check for timeout
-            if "timeout" in error_msg.lower():
-                raise DBTimeoutError(
-                    message="Query execution timed out",
-                    timeout=timeout,
-                    details={"error": error_msg}
-                )
-            
-            # General query error
-            raise QueryError(
-                message=f"Query execution failed: {error_msg}",
-                query=query,
-                details={
-                    "parameters": str(parameters),
-                    "execution_time": execution_time
-                }
-            )
-            
         except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
-            
-            log_database_query(
-                query_type="SELECT",
-                duration_ms=round(execution_time, 2),
-                error=str(e)
-            )
-            
-            raise QueryError(
-                message=f"Unexpected error during query execution: {str(e)}",
-                query=query,
-                details={
-                    "error_type": type(e).__name__,
-                    "execution_time": execution_time
-                }
-            )
+            raise self._query_error(e, query, parameters, timeout, start_ns)
+        
+        self._log_query_success(start_ns, result.row_count)
+        return result
     
     async def execute_query_async(
         self,
         query: str,
         parameters: Optional[Dict[str, Any]] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        column_oriented: bool = False
     ) -> Any:
         """
         Execute a parameterized query safely (asynchronous).
         
-        This method runs the synchronous query in a thread pool to avoid
-        blocking the event loop.
+        Uses the native async client, so no worker thread is tied up
+        while waiting for ClickHouse.
         
         Args:
             query: SQL query with placeholders
             parameters: Dictionary of parameter values
             timeout: Query timeout in seconds
+            column_oriented: Keep the result as columns (``result_columns``)
+                instead of transposing it into row tuples
             
         Returns:
             Query result object
@@ -221,15 +389,66 @@ class ClickHouseManager:
         Raises:
             QueryError: If query execution fails
             DBTimeoutError: If query times out
+            ConnectionError: If connection is lost
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor,
-            self.execute_query,
-            query,
-            parameters,
-            timeout
-        )
+        settings = get_settings()
+        client = await self.get_async_client()
+        parameters = parameters or {}
+        timeout = timeout or settings.QUERY_TIMEOUT
+        
+        start_ns = time.perf_counter_ns()
+        
+        try:
+            result = await client.query(
+                query,
+                parameters=parameters,
+                query_formats=_NATIVE_FORMAT,
+                column_oriented=column_oriented
+            )
+        except Exception as e:
+            raise self._query_error(e, query, parameters, timeout, start_ns)
+        
+        self._log_query_success(start_ns, result.row_count)
+        return result
+    
+    async def query_arrow_async(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> 'pyarrow.Table':
+        """
+        Execute a parameterized query and return the result as an Arrow table.
+        
+        The result is decoded column-wise by the driver without building
+        Python row objects. Requires the optional ``pyarrow`` dependency.
+        
+        Args:
+            query: SQL query with placeholders
+            parameters: Dictionary of parameter values
+            
+        Returns:
+            pyarrow.Table with the query result
+            
+        Raises:
+            QueryError: If query execution fails
+            DBTimeoutError: If query times out
+            ConnectionError: If connection is lost
+        """
+        settings = get_settings()
+        client = await self.get_async_client()
+        parameters = parameters or {}
+        
+        start_ns = time.perf_counter_ns()
+        
+        try:
+            table = await client.query_arrow(query, parameters=parameters)
+        except Exception as e:
+            raise self._query_error(
+                e, query, parameters, settings.QUERY_TIMEOUT, start_ns
+            )
+        
+        self._log_query_success(start_ns, table.num_rows)
+        return table
     
     def execute_command(
         self,
@@ -267,25 +486,34 @@ class ClickHouseManager:
         parameters: Optional[Dict[str, Any]] = None
     ) -> str:
         """Execute command asynchronously."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor,
-            self.execute_command,
-            command,
-            parameters
-        )
+        client = await self.get_async_client()
+        parameters = parameters or {}
+        
+        try:
+            return await client.command(command, parameters=parameters)
+        except Exception as e:
+            logger.error(f"Command execution failed: {str(e)}")
+            raise QueryError(
+                message=f"Command execution failed: {str(e)}",
+                query=command
+            )
     
     def health_check(self) -> Dict[str, Any]:
         """
         Check database connection health.
         
+        Uses ClickHouse's HTTP ``/ping`` endpoint, which involves no SQL
+        parsing on the server; ``SELECT 1`` is only sent if the ping fails.
+        
         Returns:
             Dictionary with health status and response time
         """
+        settings = get_settings()
         try:
-            start_time = time.time()
-            self._client.command("SELECT 1")
-            response_time = (time.time() - start_time) * 1000
+            start_ns = time.perf_counter_ns()
+            if not self._client.ping():
+                self._client.command("SELECT 1")
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             return {
                 "status": "up",
@@ -302,16 +530,37 @@ class ClickHouseManager:
             }
     
     async def health_check_async(self) -> Dict[str, Any]:
-        """Check database health asynchronously."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor,
-            self.health_check
-        )
+        """Check database health asynchronously (``/ping`` with SQL fallback)."""
+        settings = get_settings()
+        if self._async_client is None:
+            return {
+                "status": "down",
+                "error": "Not connected",
+                "database": settings.CLICKHOUSE_DATABASE
+            }
+        try:
+            start_ns = time.perf_counter_ns()
+            if not await self._async_client.ping():
+                await self._async_client.command("SELECT 1")
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+            
+            return {
+                "status": "up",
+                "response_time_ms": round(response_time, 2),
+                "database": settings.CLICKHOUSE_DATABASE
+            }
+            
+        except Exception as e:
+            logger.error(f"Health check failed: {str(e)}")
+            return {
+                "status": "down",
+                "error": str(e),
+                "database": settings.CLICKHOUSE_DATABASE
+            }
     
     def close(self) -> None:
         """
-        Close database connection and thread pool gracefully.
+        Close the synchronous database connection gracefully.
         """
         if self._client is not None:
             try:
@@ -321,14 +570,36 @@ class ClickHouseManager:
                 logger.warning(f"Error closing database connection: {str(e)}")
             finally:
                 self._client = None
+    
+    async def close_async(self) -> None:
+        """
+        Close both the async and synchronous connections gracefully.
         
-        if self._executor is not None:
+        Called from the application shutdown hook; there is deliberately no
+        ``__del__`` finalizer, as those run at unpredictable times and can
+        fire after module globals are torn down.
+        """
+        if self._async_client is not None:
             try:
-                self._executor.shutdown(wait=True)
-                logger.info("Thread pool executor closed")
+                await self._async_client.close()
+                logger.info("Async database connection closed")
             except Exception as e:
-                logger.warning(f"Error closing executor: {str(e)}")
-    
-    def __del__(self):
-        """Cleanup on destruction."""
+                logger.warning(f"Error closing async database connection: {str(e)}")
+            finally:
+                self._async_client = None
+        
         self.close()
+
+
+@lru_cache(maxsize=1)
+def get_clickhouse_manager() -> ClickHouseManager:
+    """
+    Get the shared ClickHouseManager instance.
+    
+    Also usable as a FastAPI dependency, which lets tests substitute the
+    manager through ``app.dependency_overrides``.
+    
+    Returns:
+        Process-wide ClickHouseManager instance
+    """
+    return ClickHouseManager()
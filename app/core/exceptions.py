@@ -6,8 +6,8 @@ all types of errors in the application, from database errors to
 validation errors.
 """
 
-from datetime import datetime
 from typing import Optional, Dict, Any
+import time
 
 
 class BaseAPIException(Exception):
@@ -22,8 +22,14 @@ class BaseAPIException(Exception):
         error_code: Machine-readable error identifier
         message: Human-readable error message
         details: Additional context about the error
+        timestamp: ISO 8601 UTC time the error was raised (``...Z``, same
+            format as the ``cached_utc_iso()`` timestamps in other responses)
     """
     
+    # status_code/error_code are class-level defaults (only stored on the
+    # instance when overridden), so they cannot be slots themselves.
+    __slots__ = ("message", "details", "timestamp")
+    
     status_code: int = 500
     error_code: str = "INTERNAL_ERROR"
     
@@ -50,6 +56,7 @@ class BaseAPIException(Exception):
         if error_code is not None:
             self.error_code = error_code
         self.details = details or {}
+        self.timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
         
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -63,7 +70,7 @@ class BaseAPIException(Exception):
             "error_code": self.error_code,
             "message": self.message,
             "details": self.details,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": self.timestamp
         }
 
 
@@ -74,6 +81,8 @@ class BaseAPIException(Exception):
 class DatabaseException(BaseAPIException):
     """Base exception for all database-related errors."""
     
+    __slots__ = ()
+    
     status_code = 503  # Service Unavailable
     error_code = "DATABASE_ERROR"
 
@@ -81,6 +90,8 @@ class DatabaseException(BaseAPIException):
 class ConnectionError(DatabaseException):
     """Raised when unable to connect to ClickHouse."""
     
+    __slots__ = ()
+    
     error_code = "DATABASE_CONNECTION_ERROR"
     
     def __init__(
@@ -94,6 +105,8 @@ class ConnectionError(DatabaseException):
 class QueryError(DatabaseException):
     """Raised when a database query fails."""
     
+    __slots__ = ()
+    
     error_code = "DATABASE_QUERY_ERROR"
     
     def __init__(
@@ -112,6 +125,8 @@ class QueryError(DatabaseException):
 class TimeoutError(DatabaseException):
     """Raised when a database query times out."""
     
+    __slots__ = ()
+    
     error_code = "DATABASE_TIMEOUT_ERROR"
     
     def __init__(
@@ -133,12 +148,29 @@ class TimeoutError(DatabaseException):
 class ValidationException(BaseAPIException):
     """Base exception for all validation errors."""
     
+    __slots__ = ()
+    
     status_code = 422  # Unprocessable Entity
     error_code = "VALIDATION_ERROR"
 
 
+# Accepted time formats; default ``expected`` text of InvalidTimeFormatError
+EXPECTED_TIME_FORMAT = (
+    "ISO 8601 format (e.g., 2025-07-01T00:00:00Z) "
+    "or legacy format (YYYYMMDD-HHmm)"
+)
+
+
 class InvalidTimeFormatError(ValidationException):
-    """Raised when time format is invalid."""
+    """
+    Raised when time format is invalid.
+    
+    Attributes:
+        provided: The rejected time string, if known
+        expected: Description of the accepted format(s)
+    """
+    
+    __slots__ = ("provided", "expected")
     
     error_code = "INVALID_TIME_FORMAT"
     
@@ -146,9 +178,11 @@ class InvalidTimeFormatError(ValidationException):
         self,
         message: str = "Invalid time format",
         provided: Optional[str] = None,
-        expected: str = "YYYYMMDD-HHmm",
+        expected: str = EXPECTED_TIME_FORMAT,
         details: Optional[Dict[str, Any]] = None
     ):
+        self.provided = provided
+        self.expected = expected
         details = details or {}
         if provided:
             details["provided"] = provided
@@ -159,6 +193,8 @@ class InvalidTimeFormatError(ValidationException):
 class InvalidSymbolError(ValidationException):
     """Raised when symbol format is invalid."""
     
+    __slots__ = ()
+    
     error_code = "INVALID_SYMBOL"
     
     def __init__(
@@ -180,6 +216,8 @@ class InvalidSymbolError(ValidationException):
 class ResourceNotFoundException(BaseAPIException):
     """Base exception for resource not found errors."""
     
+    __slots__ = ()
+    
     status_code = 404
     error_code = "RESOURCE_NOT_FOUND"
 
@@ -187,6 +225,8 @@ class ResourceNotFoundException(BaseAPIException):
 class DataNotFoundError(ResourceNotFoundException):
     """Raised when requested data is not found."""
     
+    __slots__ = ()
+    
     error_code = "DATA_NOT_FOUND"
     
     def __init__(
@@ -5,22 +5,100 @@ This module provides JSON-formatted logging with request tracking
 and performance metrics.
 """
 
+import atexit
+import contextvars
 import logging
+import os
+import queue
+import socket
 import sys
-from typing import Any, Dict
-import json
-from datetime import datetime
+import time
+import traceback
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+import msgspec
 
 from app.config import settings
 
 
+# Process-wide constants, resolved once instead of per record
+_PID = os.getpid()
+_HOST = socket.gethostname()
+
+# Output buffering: flush after this many records or this many seconds
+_FLUSH_RECORDS = 100
+_FLUSH_INTERVAL = 0.2
+
+# Structured fields for the record about to be created; set by the log
+# helpers below and attached to the record by the record factory.
+_log_context: contextvars.ContextVar[Optional[Dict[str, Any]]] = (
+    contextvars.ContextVar("log_context", default=None)
+)
+_base_record_factory = logging.getLogRecordFactory()
+
+
+def _record_factory(*args, **kwargs) -> logging.LogRecord:
+    """Create a LogRecord carrying the current structured log context."""
+    record = _base_record_factory(*args, **kwargs)
+    record.log_context = _log_context.get()
+    return record
+
+
+logging.setLogRecordFactory(_record_factory)
+
+
+class _LogEntry(msgspec.Struct, omit_defaults=True):
+    """
+    Schema of one JSON log line.
+    
+    Optional fields come from the record's ``log_context`` (or from
+    ``extra`` attributes) and are omitted from the output when unset.
+    """
+    
+    timestamp: str
+    level: str
+    logger: str
+    message: str
+    host: str
+    pid: int
+    request_id: Optional[str] = None
+    endpoint: Optional[str] = None
+    method: Optional[str] = None
+    status_code: Optional[int] = None
+    duration_ms: Optional[float] = None
+    user_agent: Optional[str] = None
+    query_type: Optional[str] = None
+    records_returned: Optional[int] = None
+    error: Optional[str] = None
+    exception: Optional[str] = None
+
+
+_encoder = msgspec.json.Encoder()
+
+
 class JSONFormatter(logging.Formatter):
     """
     Custom JSON formatter for structured logging.
     
     Converts log records to JSON format with consistent structure.
+    Only ``format()`` is used, so the base ``Formatter`` setup (format
+    string, style validation) is skipped.
     """
     
+    def __init__(self) -> None:
+        # Second-resolution timestamp prefix, reused across records
+        self._last_sec = -1
+        self._last_prefix = ""
+    
+    def _timestamp(self, created: float) -> str:
+        """Render an epoch float as ISO 8601 UTC with microseconds."""
+        sec = int(created)
+        if sec != self._last_sec:
+            self._last_sec = sec
+            self._last_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        return f"{self._last_prefix}.{int((created - sec) * 1e6):06d}Z"
+    
     def format(self, record: logging.LogRecord) -> str:
         """
         Format log record as JSON.
@@ -31,37 +109,187 @@ class JSONFormatter(logging.Formatter):
         Returns:
             JSON-formatted log string
         """
-        log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-        }
-        
-        # Add extra fields if present
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
-        
-        if hasattr(record, "endpoint"):
-            log_data["endpoint"] = record.endpoint
-        
-        if hasattr(record, "method"):
-            log_data["method"] = record.method
-        
-        if hasattr(record, "status_code"):
-            log_data["status_code"] = record.status_code
-        
-        if hasattr(record, "duration_ms"):
-            log_data["duration_ms"] = record.duration_ms
-        
-        if hasattr(record, "user_agent"):
-            log_data["user_agent"] = record.user_agent
+        return self.format_bytes(record).decode()
+    
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """
+        Format log record as UTF-8 encoded JSON.
         
+        Args:
+            record: Log record to format
+            
+        Returns:
+            JSON-formatted log line (without trailing newline)
+        """
         # Add exception info if present
+        exception = None
         if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+            # Cache on the record like logging.Formatter does
+            if not record.exc_text:
+                record.exc_text = "".join(
+                    traceback.format_exception(*record.exc_info)
+                ).rstrip("\n")
+            exception = record.exc_text
+        
+        # Skip the % formatting in getMessage() for plain string messages
+        message = record.msg
+        if record.args or not isinstance(message, str):
+            message = record.getMessage()
         
-        return json.dumps(log_data)
+        rd = record.__dict__.get("log_context") or record.__dict__
+        entry = _LogEntry(
+            timestamp=self._timestamp(record.created),
+            level=record.levelname,
+            logger=record.name,
+            message=message,
+            host=_HOST,
+            pid=_PID,
+            request_id=rd.get("request_id"),
+            endpoint=rd.get("endpoint"),
+            method=rd.get("method"),
+            status_code=rd.get("status_code"),
+            duration_ms=rd.get("duration_ms"),
+            user_agent=rd.get("user_agent"),
+            query_type=rd.get("query_type"),
+            records_returned=rd.get("records_returned"),
+            error=rd.get("error"),
+            exception=exception,
+        )
+        
+        return _encoder.encode(entry)
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process queue.
+    
+    The stock ``prepare()`` pre-formats the message and strips ``exc_info``
+    so records can be pickled; neither is needed here, and stripping
+    ``exc_info`` would lose the structured ``exception`` field.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler writing bytes to a binary stream, leaving flushing to
+    the caller.
+    
+    Formatters with a ``format_bytes()`` method (``JSONFormatter``) write
+    their encoded output directly, skipping a str decode/encode round
+    trip. The stock ``emit()`` also flushes after every record, i.e. one
+    write(2) per log line; here the owning listener decides when to flush.
+    """
+    
+    terminator = b"\n"
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            format_bytes = getattr(self.formatter, "format_bytes", None)
+            if format_bytes is not None:
+                payload = format_bytes(record)
+            else:
+                payload = self.format(record).encode("utf-8")
+            self.stream.write(payload + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _FlushingQueueListener(QueueListener):
+    """
+    QueueListener that flushes its handlers in batches.
+    
+    Handlers are flushed every ``_FLUSH_RECORDS`` records, after
+    ``_FLUSH_INTERVAL`` seconds, or as soon as the queue goes idle.
+    ERROR and above are flushed immediately so failures are never held
+    back in the buffer.
+    """
+    
+    def __init__(self, queue, *handlers, respect_handler_level=False):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def dequeue(self, block):
+        while True:
+            try:
+                timeout = _FLUSH_INTERVAL if self._pending else None
+                return self.queue.get(block, timeout=timeout)
+            except queue.Empty:
+                self.flush()
+    
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        self._pending += 1
+        if (
+            record.levelno >= logging.ERROR
+            or self._pending >= _FLUSH_RECORDS
+            or time.monotonic() - self._last_flush >= _FLUSH_INTERVAL
+        ):
+            self.flush()
+    
+    def flush(self) -> None:
+        # Errors must not escape: an exception here kills the listener
+        # thread and every later record would pile up in the queue.
+        for handler in self.handlers:
+            # A stream closed by its owner (e.g. pytest capture at exit)
+            # has nothing left to flush
+            if getattr(getattr(handler, "stream", None), "closed", False):
+                continue
+            try:
+                handler.flush()
+            except (OSError, ValueError) as e:
+                _report_flush_error(handler, e)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def stop(self) -> None:
+        try:
+            super().stop()
+        except (OSError, ValueError) as e:
+            _report_flush_error(None, e)
+        self.flush()
+
+
+def _report_flush_error(
+    handler: Optional[logging.Handler],
+    error: BaseException,
+) -> None:
+    """
+    Report a failed handler flush on stderr (if ``logging.raiseExceptions``).
+    
+    A broken stdout pipe (e.g. ``| head``) is common, so this never raises.
+    """
+    if not logging.raiseExceptions:
+        return
+    try:
+        sys.stderr.write(f"--- Logging error: flush of {handler!r} failed: {error!r}\n")
+    except Exception:
+        pass
+
+
+def _stdout_handler() -> logging.StreamHandler:
+    """
+    Create the console handler on the current ``sys.stdout``.
+    
+    Records are written as bytes to ``sys.stdout.buffer``, whose own block
+    buffer batches them until the listener flushes. Resolving the stream
+    here (not once at import) keeps later redirects of ``sys.stdout``, such
+    as pytest capture, in effect. Text-only streams without a ``buffer``
+    get a plain StreamHandler.
+    """
+    stream = getattr(sys.stdout, "buffer", None)
+    if stream is None:
+        return logging.StreamHandler(sys.stdout)
+    return _BufferedStreamHandler(stream)
+
+
+# Background listener that formats and writes queued records
+_listener: Optional[_FlushingQueueListener] = None
 
 
 def setup_logging() -> logging.Logger:
@@ -69,18 +297,21 @@ def setup_logging() -> logging.Logger:
     Setup application logging.
     
     Configures logging based on settings with either JSON or text format.
+    Records are only enqueued on the calling thread; formatting and the
+    stdout write happen on a background QueueListener thread, which writes
+    into a buffered stream and flushes in batches.
     
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger("clickhouse_api")
-    logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
+    logger.setLevel(settings.log_level_int)
     
     # Remove existing handlers
     logger.handlers.clear()
     
     # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
+    handler = _stdout_handler()
     
     # Set formatter based on LOG_FORMAT setting
     if settings.LOG_FORMAT == "json":
@@ -91,7 +322,18 @@ def setup_logging() -> logging.Logger:
         )
     
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(_LocalQueueHandler(log_queue))
+    
+    _listener = _FlushingQueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    _listener.start()
     
     return logger
 
@@ -100,6 +342,13 @@ def setup_logging() -> logging.Logger:
 logger = setup_logging()
 
 
+@atexit.register
+def _stop_listener() -> None:
+    """Drain queued records and stop the listener thread on exit."""
+    if _listener is not None:
+        _listener.stop()
+
+
 def log_request(
     request_id: str,
     method: str,
@@ -119,7 +368,17 @@ def log_request(
         duration_ms: Request duration in milliseconds
         user_agent: User agent string (optional)
     """
-    extra = {
+    if status_code >= 500:
+        level, message = logging.ERROR, "Request failed"
+    elif status_code >= 400:
+        level, message = logging.WARNING, "Request error"
+    else:
+        level, message = logging.INFO, "Request completed"
+    
+    if not logger.isEnabledFor(level):
+        return
+    
+    context = {
         "request_id": request_id,
         "method": method,
         "endpoint": endpoint,
@@ -128,14 +387,13 @@ def log_request(
     }
     
     if user_agent:
-        extra["user_agent"] = user_agent
+        context["user_agent"] = user_agent
     
-    if status_code >= 500:
-        logger.error("Request failed", extra=extra)
-    elif status_code >= 400:
-        logger.warning("Request error", extra=extra)
-    else:
-        logger.info("Request completed", extra=extra)
+    token = _log_context.set(context)
+    try:
+        logger.log(level, message)
+    finally:
+        _log_context.reset(token)
 
 
 def log_database_query(
@@ -153,16 +411,26 @@ def log_database_query(
         records_returned: Number of records returned (optional)
         error: Error message if query failed (optional)
     """
-    extra = {
+    level = logging.ERROR if error else logging.INFO
+    if not logger.isEnabledFor(level):
+        return
+    
+    context = {
         "query_type": query_type,
         "duration_ms": duration_ms,
     }
     
     if records_returned is not None:
-        extra["records_returned"] = records_returned
+        context["records_returned"] = records_returned
     
     if error:
-        extra["error"] = error
-        logger.error("Database query failed", extra=extra)
-    else:
-        logger.info("Database query executed", extra=extra)
+        context["error"] = error
+    
+    token = _log_context.set(context)
+    try:
+        if error:
+            logger.error("Database query failed")
+        else:
+            logger.info("Database query executed")
+    finally:
+        _log_context.reset(token)
@@ -0,0 +1,26 @@
+"""
+Response classes.
+
+Provides an orjson-backed JSON response used as the application's
+default response class.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+    
+    Serializes ``datetime`` objects natively (ISO 8601, with ``Z`` for
+    UTC like pydantic), so handlers can put them in the payload without
+    calling ``isoformat()``. Defined
+    here rather than imported from FastAPI, where the equivalent class
+    is deprecated in newer releases.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
@@ -5,18 +5,67 @@
 - Enhanced error handling
 """
 
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
+from fastapi import FastAPI, Request, Response, status
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager, suppress
+import asyncio
+from typing import Dict
+
+import orjson
 
 from app.config import settings
 from app.core.exceptions import BaseAPIException
-from app.core.database import ClickHouseManager
+from app.core.database import get_clickhouse_manager
 from app.core.logging_config import logger
+from app.core.responses import ORJSONResponse
 from app.middleware.logging import LoggingMiddleware
-from app.routers import health_router
-from app.routers.ohlcv import router as ohlcv_router
+from app.routers import health_router, ohlcv_router
+from app.routers.health import db_health_monitor
+from app.utils.time_parser import cached_utc_iso, cached_utc_now
+
+
+# ============================================================================
+# Lifespan
+# ============================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown tasks with enhanced logging."""
+    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    logger.info(f"Environment: {settings.ENVIRONMENT}")
+    logger.info(f"ClickHouse: {settings.CLICKHOUSE_HOST}:{settings.CLICKHOUSE_PORT}")
+    logger.info(f"Log Level: {settings.LOG_LEVEL}")
+    logger.info(f"Log Format: {settings.LOG_FORMAT}")
+    
+    # Initialize database connection
+    db = app.state.db = get_clickhouse_manager()
+    try:
+        await db.connect_async()
+        logger.info("Database connection established successfully")
+    except Exception as e:
+        logger.error(f"Failed to connect to database: {str(e)}")
+        logger.warning("API will start but database endpoints may fail")
+    
+    # Keep the health endpoints' database status fresh in the background
+    health_monitor = asyncio.create_task(db_health_monitor(db))
+    
+    yield
+    
+    logger.info(f"Shutting down {settings.APP_NAME}")
+    
+    health_monitor.cancel()
+    with suppress(asyncio.CancelledError):
+        await health_monitor
+    
+    # Close database connections
+    await db.close_async()
+    logger.info("Database connections closed successfully")
+    logger.info("Shutdown complete")
 
 
 # ============================================================================
@@ -40,10 +89,13 @@ app = FastAPI(
     ## Repository
     GitHub: https://github.com/Farhad-Valipour/ClickHouseAPI
     """,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
+    # Served by the cached routes under "API Documentation" below
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -51,18 +103,15 @@ app = FastAPI(
 # Middleware
 # ============================================================================
 
-# CORS Middleware
+# Logging + CORS Middleware (single ASGI layer)
 app.add_middleware(
-    CORSMiddleware,
+    LoggingMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Logging Middleware (Phase 2)
-app.add_middleware(LoggingMiddleware)
-
 
 # ============================================================================
 # Exception Handlers
@@ -80,7 +129,7 @@ async def api_exception_handler(request: Request, exc: BaseAPIException):
             "method": request.method
         }
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=exc.to_dict()
     )
@@ -96,18 +145,31 @@ async def value_error_handler(request: Request, exc: ValueError):
             "method": request.method
         }
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
             "error_code": "VALIDATION_ERROR",
             "message": str(exc),
             "details": {},
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": cached_utc_now()
         }
     )
 
 
+INTERNAL_ERROR_MESSAGE = "An internal error occurred. Please try again later."
+
+# Production 500 body is fixed apart from its timestamp, so it is
+# serialized once and the timestamp is spliced in per error.
+_INTERNAL_ERROR_PREFIX = orjson.dumps({
+    "success": False,
+    "error_code": "INTERNAL_ERROR",
+    "message": INTERNAL_ERROR_MESSAGE,
+    "details": {},
+})[:-1] + b',"timestamp":"'
+_INTERNAL_ERROR_SUFFIX = b'"}'
+
+
 @app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions with logging."""
@@ -120,53 +182,26 @@ async def generic_exception_handler(request: Request, exc: Exception):
         }
     )
     
-    return JSONResponse(
+    if settings.is_production:
+        timestamp = cached_utc_iso().encode()
+        return Response(
+            content=_INTERNAL_ERROR_PREFIX + timestamp + _INTERNAL_ERROR_SUFFIX,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            media_type="application/json"
+        )
+    
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
             "error_code": "INTERNAL_ERROR",
-            "message": "An internal error occurred. Please try again later.",
-            "details": {} if settings.is_production() else {"error": str(exc)},
-            "timestamp": datetime.utcnow().isoformat()
+            "message": INTERNAL_ERROR_MESSAGE,
+            "details": {"error": str(exc)},
+            "timestamp": cached_utc_now()
         }
     )
 
 
-# ============================================================================
-# Lifecycle Events
-# ============================================================================
-
-@app.on_event("startup")
-async def startup_event():
-    """Application startup tasks with enhanced logging."""
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info(f"ClickHouse: {settings.CLICKHOUSE_HOST}:{settings.CLICKHOUSE_PORT}")
-    logger.info(f"Log Level: {settings.LOG_LEVEL}")
-    logger.info(f"Log Format: {settings.LOG_FORMAT}")
-    
-    # Initialize database connection
-    db = ClickHouseManager()
-    try:
-        db.connect()
-        logger.info("Database connection established successfully")
-    except Exception as e:
-        logger.error(f"Failed to connect to database: {str(e)}")
-        logger.warning("API will start but database endpoints may fail")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown tasks with enhanced logging."""
-    logger.info(f"Shutting down {settings.APP_NAME}")
-    
-    # Close database connections
-    db = ClickHouseManager()
-    db.close()
-    logger.info("Database connections closed successfully")
-    logger.info("Shutdown complete")
-
-
 # ============================================================================
 # Include Routers
 # ============================================================================
@@ -185,10 +220,92 @@ app.include_router(
 )
 
 
+# ============================================================================
+# API Documentation
+# ============================================================================
+
+OPENAPI_URL = "/openapi.json"
+
+# Serialized OpenAPI schema per ASGI root_path, built on first request
+# (after all routes exist). root_path is set by the server config, not the
+# client, so there are only ever one or two entries.
+_openapi_bytes: Dict[str, bytes] = {}
+
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json(request: Request) -> Response:
+    """
+    Serve the OpenAPI schema from a cached, pre-serialized body.
+    
+    Like FastAPI's built-in route, a non-empty root_path is listed first in
+    ``servers`` so "Try it out" calls go through the proxy prefix.
+    """
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    body = _openapi_bytes.get(root_path)
+    if body is None:
+        schema = app.openapi()
+        servers = schema.get("servers") or []
+        if (
+            root_path
+            and app.root_path_in_servers
+            and all(server.get("url") != root_path for server in servers)
+        ):
+            schema = {**schema, "servers": [{"url": root_path}, *servers]}
+        body = _openapi_bytes[root_path] = orjson.dumps(schema)
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui_html(request: Request) -> HTMLResponse:
+    """Swagger UI backed by the cached schema."""
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    return get_swagger_ui_html(
+        openapi_url=root_path + OPENAPI_URL,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url=root_path + "/docs/oauth2-redirect",
+    )
+
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_ui_redirect() -> HTMLResponse:
+    """OAuth2 redirect page used by Swagger UI."""
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_html(request: Request) -> HTMLResponse:
+    """ReDoc backed by the cached schema."""
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    return get_redoc_html(
+        openapi_url=root_path + OPENAPI_URL,
+        title=f"{app.title} - ReDoc",
+    )
+
+
 # ============================================================================
 # Root Endpoint
 # ============================================================================
 
+# Only the timestamp changes between calls, so the rest of the body is
+# serialized once here and the timestamp is spliced in per request.
+_ROOT_PREFIX = orjson.dumps({
+    "service": settings.APP_NAME,
+    "version": settings.APP_VERSION,
+    "status": "running",
+    "docs": {
+        "swagger": "/docs",
+        "redoc": "/redoc",
+        "openapi": "/openapi.json"
+    },
+    "endpoints": {
+        "health": "/health",
+        "ohlcv": f"{settings.API_PREFIX}/ohlcv"
+    },
+    "Git":"https://github.com/Farhad-Valipour/ClickHouseAPI",
+})[:-1] + b',"timestamp":"'
+_ROOT_SUFFIX = b'"}'
+
+
 @app.get(
     "/",
     tags=["Root"],
@@ -197,22 +314,11 @@ app.include_router(
 )
 async def root():
     """Root endpoint providing API information."""
-    return {
-        "service": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "status": "running",
-        "docs": {
-            "swagger": "/docs",
-            "redoc": "/redoc",
-            "openapi": "/openapi.json"
-        },
-        "endpoints": {
-            "health": "/health",
-            "ohlcv": f"{settings.API_PREFIX}/ohlcv"
-        },
-        "Git":"https://github.com/Farhad-Valipour/ClickHouseAPI",
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    timestamp = cached_utc_iso().encode()
+    return Response(
+        content=_ROOT_PREFIX + timestamp + _ROOT_SUFFIX,
+        media_type="application/json"
+    )
 
 
 # ============================================================================
@@ -227,5 +333,5 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.log_level_int
     )
@@ -2,69 +2,127 @@
 Logging middleware for request/response tracking.
 
 This middleware logs all incoming requests and their responses
-with performance metrics.
+with performance metrics, and applies the CORS policy in the same
+ASGI layer.
 """
 
+import os
 import time
-import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import Message, Receive, Scope, Send
 
 from app.core.logging_config import log_request
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+# Random bytes for request IDs, read from the OS in blocks instead of
+# one os.urandom(16) call per request
+_RAND_POOL_SIZE = 4096
+_rand_pool = b""
+_rand_pos = _RAND_POOL_SIZE
+
+
+def _reset_rand_pool() -> None:
+    """Drop the pool so a forked worker never reuses its parent's bytes."""
+    global _rand_pool, _rand_pos
+    _rand_pool = b""
+    _rand_pos = _RAND_POOL_SIZE
+
+
+os.register_at_fork(after_in_child=_reset_rand_pool)
+
+# Raw (lowercase) header names as they appear in ASGI messages
+_H_REQUEST_ID = b"x-request-id"
+_H_USER_AGENT = b"user-agent"
+_UA_DEFAULT = "Unknown"
+
+
+def _new_request_id() -> str:
     """
-    Middleware for logging HTTP requests and responses.
+    Generate a random 128-bit request ID from the shared byte pool.
+    
+    Called from the event loop without awaiting, so the pool needs no
+    lock.
     
+    Returns:
+        32-character lowercase hex string
+    """
+    global _rand_pool, _rand_pos
+    if _rand_pos >= _RAND_POOL_SIZE:
+        _rand_pool = os.urandom(_RAND_POOL_SIZE)
+        _rand_pos = 0
+    start = _rand_pos
+    _rand_pos += 16
+    return _rand_pool[start:_rand_pos].hex()
+
+
+def _user_agent(scope: Scope) -> str:
+    """Read the User-Agent straight from the raw ASGI request headers."""
+    for name, value in scope["headers"]:
+        if name == _H_USER_AGENT:
+            return value.decode("latin-1")
+    return _UA_DEFAULT
+
+
+class LoggingMiddleware(CORSMiddleware):
+    """
+    Middleware for logging HTTP requests and responses.
+
     This middleware:
     - Generates unique request IDs
     - Tracks request duration
     - Logs request/response details
     - Adds request ID to response headers
+    - Applies CORS headers and answers preflight requests
+
+    It is a plain ASGI middleware built on Starlette's ``CORSMiddleware``,
+    so CORS handling and request logging cost a single middleware layer.
+    Keyword arguments are the ``CORSMiddleware`` options.
     """
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request and log details.
-        
+
         Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/handler in chain
-            
-        Returns:
-            HTTP response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())
-        
-        # Add request ID to request state
-        request.state.request_id = request_id
-        
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Generate unique request ID and expose it as request.state.request_id
+        request_id = _new_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_header = (_H_REQUEST_ID, request_id.encode("latin-1"))
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+            await send(message)
+
         # Record start time
-        start_time = time.time()
-        
-        # Process request
-        response = await call_next(request)
-        
+        start_ns = time.perf_counter_ns()
+
+        # Process request (CORS handling happens in the base class)
+        await super().__call__(scope, receive, send_wrapper)
+
         # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
-        
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-        
-        # Get user agent
-        user_agent = request.headers.get("user-agent", "Unknown")
-        
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+
         # Log request
         log_request(
             request_id=request_id,
-            method=request.method,
-            endpoint=request.url.path,
-            status_code=response.status_code,
+            method=scope["method"],
+            endpoint=scope["path"],
+            status_code=status_code,
             duration_ms=round(duration_ms, 2),
-            user_agent=user_agent
+            user_agent=_user_agent(scope)
         )
-        
-        return response
@@ -7,17 +7,81 @@ documentation for API request parameters.
 Updated to support ISO 8601 format with backward compatibility.
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
-from datetime import datetime
-import re
+from pydantic import (
+    BaseModel,
+    Field,
+    StringConstraints,
+    field_validator,
+    model_validator,
+)
+from typing import Annotated, Optional, List
 
+from app.core.exceptions import InvalidTimeFormatError
+from app.utils.time_parser import is_iso_shape, is_legacy_shape, parse_time_naive
 
-# ISO 8601 regex pattern for validation
-ISO8601_PATTERN = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?$'
 
-# Legacy format pattern (for backward compatibility)
-LEGACY_PATTERN = r'^\d{8}-\d{4}$'
+# Trading symbol; length limits are enforced by pydantic-core
+Symbol = Annotated[str, StringConstraints(min_length=1, max_length=50)]
+
+
+def _end_before_start(start: str, end: str) -> bool:
+    """
+    Whether ``end`` is earlier than ``start`` (naive wall-clock times).
+    
+    ISO 8601 orders lexicographically, so when both are ISO strings whose
+    seconds-resolution prefixes differ, comparing those prefixes decides
+    it without touching datetimes; fractions and offsets only matter when
+    the prefixes are equal.
+    """
+    if is_iso_shape(start) and is_iso_shape(end):
+        start_sec, end_sec = start[:19], end[:19]
+        if start_sec != end_sec:
+            return end_sec < start_sec
+    return parse_time_naive(end) < parse_time_naive(start)
+
+
+def _validate_time_string(v: Optional[str]) -> Optional[str]:
+    """
+    Validate a start/end time string, shared by the query models.
+    
+    Accepts both ISO 8601 format (recommended) and legacy format (deprecated).
+    
+    Args:
+        v: Time string to validate
+    
+    Returns:
+        Validated time string
+    
+    Raises:
+        ValueError: If time format is invalid
+    """
+    if v is None:
+        return v
+    
+    # Check if shaped like ISO 8601
+    iso_match = is_iso_shape(v)
+    
+    # Check if shaped like the legacy format
+    legacy_match = is_legacy_shape(v)
+    
+    if not iso_match and not legacy_match:
+        raise ValueError(
+            f"Invalid time format: {v}. Expected ISO 8601 format "
+            f"(e.g., 2025-07-01T00:00:00Z, 2025-07-01T00:00:00+03:00) "
+            f"or legacy format (YYYYMMDD-HHmm)"
+        )
+    
+    # Try to parse to ensure it's a valid datetime
+    try:
+        parse_time_naive(v)
+    except InvalidTimeFormatError:
+        raise ValueError(
+            f"Invalid time value: {v}. Could not parse as datetime. "
+            f"Use ISO 8601 format (e.g., 2025-07-01T00:00:00Z) "
+            f"or legacy format (YYYYMMDD-HHmm)"
+        )
+    
+    return v
 
 
 class OHLCVQueryParams(BaseModel):
@@ -64,6 +128,14 @@ class OHLCVQueryParams(BaseModel):
         description="Number of records to skip (for pagination)"
     )
     
+    cursor: Optional[str] = Field(
+        None,
+        description=(
+            "Resume after the page that returned this metadata.next_cursor "
+            "(replaces offset)"
+        )
+    )
+    
     @field_validator('start', 'end')
     @classmethod
     def validate_time_format(cls, v: Optional[str]) -> Optional[str]:
@@ -81,108 +153,35 @@ class OHLCVQueryParams(BaseModel):
         Raises:
             ValueError: If time format is invalid
         """
-        if v is None:
-            return v
-        
-        # Check if matches ISO 8601 pattern
-        iso_match = re.match(ISO8601_PATTERN, v)
-        
-        # Check if matches legacy pattern
-        legacy_match = re.match(LEGACY_PATTERN, v)
-        
-        if not iso_match and not legacy_match:
-            raise ValueError(
-                f"Invalid time format: {v}. Expected ISO 8601 format "
-                f"(e.g., 2025-07-01T00:00:00Z, 2025-07-01T00:00:00+03:00) "
-                f"or legacy format (YYYYMMDD-HHmm)"
-            )
-        
-        # Try to parse to ensure it's a valid datetime
-        try:
-            if iso_match:
-                # ISO 8601 format
-                if v.endswith('Z'):
-                    base_str = v[:-1]
-                    if '.' in base_str:
-                        datetime.strptime(base_str, "%Y-%m-%dT%H:%M:%S.%f")
-                    else:
-                        datetime.strptime(base_str, "%Y-%m-%dT%H:%M:%S")
-                elif '+' in v or v.count('-') > 2:
-                    # With timezone offset
-                    datetime.fromisoformat(v)
-                else:
-                    # Basic format
-                    if '.' in v:
-                        datetime.strptime(v, "%Y-%m-%dT%H:%M:%S.%f")
-                    else:
-                        datetime.strptime(v, "%Y-%m-%dT%H:%M:%S")
-            else:
-                # Legacy format
-                datetime.strptime(v, "%Y%m%d-%H%M")
-            
-            return v
-            
-        except ValueError:
-            raise ValueError(
-                f"Invalid time value: {v}. Could not parse as datetime. "
-                f"Use ISO 8601 format (e.g., 2025-07-01T00:00:00Z) "
-                f"or legacy format (YYYYMMDD-HHmm)"
-            )
-    
-    @field_validator('end')
-    @classmethod
-    def validate_time_range(cls, v: Optional[str], info) -> Optional[str]:
+        return _validate_time_string(v)
+    
+    @model_validator(mode='after')
+    def validate_time_range(self) -> 'OHLCVQueryParams':
         """
         Ensure end time is not before start time.
         
         Note: Equal times are allowed (e.g., to get a specific candle)
-        Handles both ISO 8601 and legacy formats.
+        Handles both ISO 8601 and legacy formats. Runs after the field
+        validators, so both times are known to parse.
         """
-        if v and 'start' in info.data:
-            start_str = info.data['start']
-            
-            # Parse both times
-            try:
-                # Detect format and parse accordingly
-                if re.match(ISO8601_PATTERN, start_str):
-                    # ISO 8601
-                    if start_str.endswith('Z'):
-                        base = start_str[:-1]
-                        start_dt = datetime.strptime(base.split('.')[0], "%Y-%m-%dT%H:%M:%S")
-                    elif '+' in start_str or start_str.count('-') > 2:
-                        start_dt = datetime.fromisoformat(start_str).replace(tzinfo=None)
-                    else:
-                        start_dt = datetime.strptime(start_str.split('.')[0], "%Y-%m-%dT%H:%M:%S")
-                else:
-                    # Legacy format
-                    start_dt = datetime.strptime(start_str, "%Y%m%d-%H%M")
-                
-                if re.match(ISO8601_PATTERN, v):
-                    # ISO 8601
-                    if v.endswith('Z'):
-                        base = v[:-1]
-                        end_dt = datetime.strptime(base.split('.')[0], "%Y-%m-%dT%H:%M:%S")
-                    elif '+' in v or v.count('-') > 2:
-                        end_dt = datetime.fromisoformat(v).replace(tzinfo=None)
-                    else:
-                        end_dt = datetime.strptime(v.split('.')[0], "%Y-%m-%dT%H:%M:%S")
-                else:
-                    # Legacy format
-                    end_dt = datetime.strptime(v, "%Y%m%d-%H%M")
-                
-                if end_dt < start_dt:
-                    raise ValueError("End time cannot be before start time")
-                    
-            except ValueError as e:
-                if "End time cannot be before start time" in str(e):
-                    raise
-                # If parsing fails, let it pass - will be caught by validate_time_format
-                pass
+        if self.end and _end_before_start(self.start, self.end):
+            raise ValueError("End time cannot be before start time")
         
-        return v
+        return self
+    
+    @model_validator(mode='after')
+    def validate_cursor_offset(self) -> 'OHLCVQueryParams':
+        """A cursor already marks where the page starts; offset must be 0."""
+        if self.cursor is not None and self.offset:
+            raise ValueError("offset cannot be combined with cursor")
+        return self
     
     class Config:
         """Pydantic model configuration."""
+        # Built once per request from known query parameters and never
+        # modified afterwards
+        frozen = True
+        extra = "forbid"
         json_schema_extra = {
             "example": {
                 "symbol": "BINANCE:BTCUSDT.P",
@@ -204,7 +203,7 @@ class MultiSymbolQueryParams(BaseModel):
     Legacy format also supported: YYYYMMDD-HHmm (deprecated)
     """
     
-    symbols: List[str] = Field(
+    symbols: List[Symbol] = Field(
         ...,
         min_length=1,
         max_length=100,
@@ -236,28 +235,6 @@ class MultiSymbolQueryParams(BaseModel):
         description="Number of records to skip per symbol"
     )
     
-    @field_validator('symbols')
-    @classmethod
-    def validate_symbols(cls, v: List[str]) -> List[str]:
-        """
-        Validate each symbol in the list.
-        
-        Args:
-            v: List of symbols
-            
-        Returns:
-            Validated list of symbols
-            
-        Raises:
-            ValueError: If any symbol is invalid
-        """
-        for symbol in v:
-            if not symbol or len(symbol) > 50:
-                raise ValueError(
-                    f"Invalid symbol: {symbol}. Must be 1-50 characters."
-                )
-        return v
-    
     @field_validator('start', 'end')
     @classmethod
     def validate_time_format(cls, v: Optional[str]) -> Optional[str]:
@@ -266,49 +243,7 @@ class MultiSymbolQueryParams(BaseModel):
         
         Accepts both ISO 8601 format (recommended) and legacy format (deprecated).
         """
-        if v is None:
-            return v
-        
-        # Check if matches ISO 8601 pattern
-        iso_match = re.match(ISO8601_PATTERN, v)
-        
-        # Check if matches legacy pattern
-        legacy_match = re.match(LEGACY_PATTERN, v)
-        
-        if not iso_match and not legacy_match:
-            raise ValueError(
-                f"Invalid time format: {v}. Expected ISO 8601 format "
-                f"(e.g., 2025-07-01T00:00:00Z) or legacy format (YYYYMMDD-HHmm)"
-            )
-        
-        # Try to parse to ensure it's a valid datetime
-        try:
-            if iso_match:
-                # ISO 8601 format
-                if v.endswith('Z'):
-                    base_str = v[:-1]
-                    if '.' in base_str:
-                        datetime.strptime(base_str, "%Y-%m-%dT%H:%M:%S.%f")
-                    else:
-                        datetime.strptime(base_str, "%Y-%m-%dT%H:%M:%S")
-                elif '+' in v or v.count('-') > 2:
-                    datetime.fromisoformat(v)
-                else:
-                    if '.' in v:
-                        datetime.strptime(v, "%Y-%m-%dT%H:%M:%S.%f")
-                    else:
-                        datetime.strptime(v, "%Y-%m-%dT%H:%M:%S")
-            else:
-                # Legacy format
-                datetime.strptime(v, "%Y%m%d-%H%M")
-            
-            return v
-            
-        except ValueError:
-            raise ValueError(
-                f"Invalid time value: {v}. Use ISO 8601 format "
-                f"(e.g., 2025-07-01T00:00:00Z) or legacy format (YYYYMMDD-HHmm)"
-            )
+        return _validate_time_string(v)
     
     class Config:
         """Pydantic model configuration."""
@@ -338,25 +273,6 @@ class LatestQueryParams(BaseModel):
         examples=["BINANCE:BTCUSDT.P"]
     )
     
-    @field_validator('symbol')
-    @classmethod
-    def validate_symbol(cls, v: str) -> str:
-        """
-        Validate symbol format.
-        
-        Args:
-            v: Symbol string
-            
-        Returns:
-            Validated symbol
-            
-        Raises:
-            ValueError: If symbol is invalid
-        """
-        if not v or len(v) > 50:
-            raise ValueError("Symbol must be 1-50 characters")
-        return v
-    
     class Config:
         """Pydantic model configuration."""
         json_schema_extra = {
@@ -364,3 +280,9 @@ class LatestQueryParams(BaseModel):
                 "symbol": "BINANCE:BTCUSDT.P"
             }
         }
+
+
+# Core validators bound once, so request handlers can validate a plain
+# dict without going through the model's __init__ kwargs handling
+validate_ohlcv_params = OHLCVQueryParams.__pydantic_validator__.validate_python
+validate_latest_params = LatestQueryParams.__pydantic_validator__.validate_python
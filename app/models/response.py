@@ -9,6 +9,8 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+from app.utils.time_parser import cached_utc_now
+
 
 class OHLCVData(BaseModel):
     """
@@ -55,10 +57,6 @@ class OHLCVData(BaseModel):
     
     class Config:
         """Pydantic model configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        
         json_schema_extra = {
             "example": {
                 "candle_time": "2025-07-01T00:00:00",
@@ -100,21 +98,20 @@ class ResponseMetadata(BaseModel):
         description="Whether more records are available"
     )
     
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as cursor to fetch the next page (null on the last page)"
+    )
+    
     query_time_ms: float = Field(
         ...,
         description="Query execution time in milliseconds"
     )
     
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=cached_utc_now,
         description="Response generation timestamp"
     )
-    
-    class Config:
-        """Pydantic model configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class LatestResponseMetadata(BaseModel):
 
@@ -184,23 +181,12 @@ class LatestResponseMetadata(BaseModel):
 
     timestamp: datetime = Field(
 
-        default_factory=datetime.utcnow,
+        default_factory=cached_utc_now,
 
         description="Response generation timestamp"
 
     )
 
-    
-
-    class Config:
-
-        """Pydantic model configuration."""
-
-        json_encoders = {
-
-            datetime: lambda v: v.isoformat()
-
-        }
 
 
 
@@ -252,6 +238,7 @@ class OHLCVResponse(BaseModel):
                     "limit": 1000,
                     "offset": 0,
                     "has_more": False,
+                    "next_cursor": None,
                     "query_time_ms": 45.2,
                     "timestamp": "2025-11-13T10:30:45.123Z"
                 }
@@ -390,16 +377,12 @@ class ErrorResponse(BaseModel):
     )
     
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=cached_utc_now,
         description="Error occurrence timestamp"
     )
     
     class Config:
         """Pydantic model configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        
         json_schema_extra = {
             "example": {
                 "success": False,
@@ -452,16 +435,12 @@ class HealthResponse(BaseModel):
     )
     
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=cached_utc_now,
         description="Health check timestamp"
     )
     
     class Config:
         """Pydantic model configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        
         json_schema_extra = {
             "example": {
                 "status": "healthy",
@@ -485,7 +464,7 @@ class DetailedHealthResponse(BaseModel):
     )
     
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=cached_utc_now,
         description="Health check timestamp"
     )
     
@@ -496,10 +475,6 @@ class DetailedHealthResponse(BaseModel):
     
     class Config:
         """Pydantic model configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-        
         json_schema_extra = {
             "example": {
                 "status": "healthy",
@@ -5,17 +5,110 @@ These endpoints provide health status information for monitoring
 and orchestration tools (e.g., Kubernetes health probes).
 """
 
-from fastapi import APIRouter
-from datetime import datetime
+from fastapi import APIRouter, Depends, Response, status
+from typing import Any, Dict, Optional
+import asyncio
 import time
 
 from app.config import settings
-from app.core.database import ClickHouseManager
+from app.core.database import ClickHouseManager, get_clickhouse_manager
+from app.core.exceptions import ConnectionError as DBConnectionError
 from app.core.logging_config import logger
+from app.core.responses import ORJSONResponse
+from app.utils.time_parser import cached_utc_iso
 
 
 router = APIRouter()
 
+# Settings are immutable, so the reported version is bound once
+_VERSION = settings.APP_VERSION
+
+
+# Liveness response body, regenerated when the cached timestamp changes
+_LIVE_PREFIX = b'{"success":true,"alive":true,"timestamp":"'
+_live_timestamp = ""
+_live_body = b""
+
+
+# Last database ping result: (manager, monotonic time, health dict).
+# Refreshed by db_health_monitor() in the background so probes don't each
+# ping ClickHouse; the manager is part of the entry so a swapped
+# dependency (e.g. in tests) never sees another manager's status.
+_db_health: Optional[tuple] = None
+
+
+async def _refresh_db_health(db: ClickHouseManager) -> Dict[str, Any]:
+    """
+    Ping the database and store the result as the cached status.
+    
+    The ping is bounded by HEALTH_CHECK_TIMEOUT so a slow or wedged
+    database reports "down" instead of stalling the probe.
+    """
+    global _db_health
+    try:
+        result = await asyncio.wait_for(
+            db.health_check_async(),
+            timeout=settings.HEALTH_CHECK_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        logger.error("Health check timed out")
+        result = {
+            "status": "down",
+            "error": f"Database ping timed out after {settings.HEALTH_CHECK_TIMEOUT}s",
+            "database": settings.CLICKHOUSE_DATABASE
+        }
+    _db_health = (db, time.monotonic(), result)
+    return result
+
+
+async def _cached_db_health(db: ClickHouseManager) -> Dict[str, Any]:
+    """
+    Database health, from the background monitor when it is recent.
+    
+    Falls back to a direct ping if the cached status is missing or older
+    than two monitor intervals (e.g. the monitor is not running).
+    """
+    cached = _db_health
+    if (
+        cached is not None
+        and cached[0] is db
+        and time.monotonic() - cached[1] <= 2 * settings.HEALTH_CHECK_INTERVAL
+    ):
+        return cached[2]
+    return await _refresh_db_health(db)
+
+
+async def db_health_monitor(db: ClickHouseManager) -> None:
+    """
+    Ping the database every HEALTH_CHECK_INTERVAL seconds until cancelled.
+    
+    Started from the application lifespan. If the client is missing (e.g.
+    the startup connect failed) it reconnects first, since an unready pod
+    receives no traffic that would reconnect through get_async_client().
+    Attempts are rate-limited by the CONNECT_FAILURE_COOLDOWN circuit.
+    """
+    while True:
+        try:
+            if not db.is_connected:
+                try:
+                    await db.connect_async()
+                except DBConnectionError as e:
+                    logger.warning(f"Database reconnect failed: {e.message}")
+            await _refresh_db_health(db)
+        except Exception as e:
+            logger.error(f"Background health check failed: {str(e)}")
+        await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL)
+
+
+def _live_response_body() -> bytes:
+    """Serialized liveness payload, cached at one-second resolution."""
+    global _live_timestamp, _live_body
+    timestamp = cached_utc_iso()
+    if timestamp is not _live_timestamp:
+        _live_timestamp = timestamp
+        _live_body = _LIVE_PREFIX + timestamp.encode() + b'"}'
+    return _live_body
+
 
 @router.get(
     "/health",
@@ -27,7 +120,7 @@ router = APIRouter()
         503: {"description": "API is unhealthy"},
     }
 )
-async def health_check():
+async def health_check(db: ClickHouseManager = Depends(get_clickhouse_manager)):
     """
     Check the health status of the API and database connection.
     
@@ -38,111 +131,130 @@ async def health_check():
     - `database`: Database connection status
     - `version`: API version
     - `query_time_ms`: Health check execution time
+    
+    The database status comes from the background monitor, so probes
+    don't ping ClickHouse themselves. Responds with 503 when unhealthy.
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     try:
-        db = ClickHouseManager()
-        
-        # Check database connection
-        db_start = time.time()
-        db_health = db.health_check()
-        ping_duration = (time.time() - db_start) * 1000
+        # Check database connection (cached by the background monitor)
+        db_health = await _cached_db_health(db)
+        ping_duration = db_health.get("response_time_ms", 0.0)
         
         # Calculate total query time
-        query_time_ms = (time.time() - start_time) * 1000
+        query_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         
         if db_health["status"] != "up":
             logger.error("Database connection failed")
-            return {
-                "success": False,
-                "status": "unhealthy",
-                "timestamp": datetime.utcnow().isoformat(),
-                "database": {
-                    "connected": False,
-                    "error": db_health.get("error", "Failed to ping database")
-                },
-                "version": settings.APP_VERSION,
-                "query_time_ms": round(query_time_ms, 2)
-            }
+            return ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "success": False,
+                    "status": "unhealthy",
+                    "timestamp": cached_utc_iso(),
+                    "database": {
+                        "connected": False,
+                        "error": db_health.get("error", "Failed to ping database")
+                    },
+                    "version": _VERSION,
+                    "query_time_ms": round(query_time_ms, 2)
+                }
+            )
         
         logger.info(f"Health check successful, ping_ms={round(ping_duration, 2)}")
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": cached_utc_iso(),
             "database": {
                 "connected": True,
                 "ping_ms": round(ping_duration, 2)
             },
-            "version": settings.APP_VERSION,
+            "version": _VERSION,
             "query_time_ms": round(query_time_ms, 2)
-        }
+        })
     
     except Exception as e:
-        query_time_ms = (time.time() - start_time) * 1000
+        query_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         logger.error(f"Health check failed: {str(e)}")
-        return {
-            "success": False,
-            "status": "unhealthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "database": {
-                "connected": False,
-                "error": str(e)
-            },
-            "version": settings.APP_VERSION,
-            "query_time_ms": round(query_time_ms, 2)
-        }
+        return ORJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "success": False,
+                "status": "unhealthy",
+                "timestamp": cached_utc_iso(),
+                "database": {
+                    "connected": False,
+                    "error": str(e)
+                },
+                "version": _VERSION,
+                "query_time_ms": round(query_time_ms, 2)
+            }
+        )
 
 
 @router.get(
     "/health/ready",
     summary="Readiness check",
     description="Check if API is ready to handle requests",
-    tags=["Health"]
+    tags=["Health"],
+    responses={
+        200: {"description": "API is ready"},
+        503: {"description": "API is not ready"},
+    }
 )
-async def readiness_check():
+async def readiness_check(db: ClickHouseManager = Depends(get_clickhouse_manager)):
     """
     Check if the API is ready to handle requests.
     Used by orchestration systems like Kubernetes.
+    
+    Responds with 503 when not ready, so probes take the pod out of rotation.
     """
     try:
-        db = ClickHouseManager()
-        
         # Check if database manager is initialized
-        if db._client is None:
-            return {
-                "success": False,
-                "ready": False,
-                "reason": "Database not initialized",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+        if not db.is_connected:
+            return ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "success": False,
+                    "ready": False,
+                    "reason": "Database not initialized",
+                    "timestamp": cached_utc_iso()
+                }
+            )
         
-        # Verify connection
-        db_health = db.health_check()
+        # Verify connection (cached by the background monitor)
+        db_health = await _cached_db_health(db)
         
         if db_health["status"] != "up":
-            return {
-                "success": False,
-                "ready": False,
-                "reason": "Database connection unhealthy",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            return ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "success": False,
+                    "ready": False,
+                    "reason": "Database connection unhealthy",
+                    "timestamp": cached_utc_iso()
+                }
+            )
         
         return {
             "success": True,
             "ready": True,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": cached_utc_iso()
         }
     
     except Exception as e:
-        return {
-            "success": False,
-            "ready": False,
-            "reason": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return ORJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "success": False,
+                "ready": False,
+                "reason": str(e),
+                "timestamp": cached_utc_iso()
+            }
+        )
 
 
 @router.get(
@@ -156,8 +268,4 @@ async def liveness_check():
     Check if the API is alive.
     Used by orchestration systems like Kubernetes.
     """
-    return {
-        "success": True,
-        "alive": True,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return Response(content=_live_response_body(), media_type="application/json")
@@ -7,21 +7,125 @@ by not blocking the event loop during database operations.
 Updated to support ISO 8601 time format with backward compatibility.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Literal, Tuple
+import asyncio
+import importlib.util
 import time
 
 from app.config import settings
-from app.core.database import ClickHouseManager
+from app.core.database import ClickHouseManager, get_clickhouse_manager
 from app.core.exceptions import DatabaseException
-from app.models.request import OHLCVQueryParams, LatestQueryParams
-from app.models.response import OHLCVData, OHLCVResponse, ResponseMetadata, LatestOHLCVResponse, LatestResponseMetadata
-from app.utils.time_parser import parse_time_param
+from app.models.request import (
+    OHLCVQueryParams,
+    validate_latest_params,
+    validate_ohlcv_params,
+)
+from app.models.response import OHLCVResponse, LatestOHLCVResponse
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.time_parser import cached_utc_now, parse_time_param
 from app.core.logging_config import logger
+from app.core.responses import ORJSONResponse
 
 router = APIRouter(prefix="/ohlcv", tags=["OHLCV"])
 
 
+def _quote_identifier(name: str) -> str:
+    """Backtick-quote a ClickHouse identifier (``table`` or ``db.table``)."""
+    return ".".join(
+        "`" + part.replace("\\", "\\\\").replace("`", "\\`") + "`"
+        for part in name.split(".")
+    )
+
+
+# The table is fixed for the life of the process, so it is quoted into the
+# SQL once instead of being bound as a parameter on every request
+_TABLE = _quote_identifier(settings.CLICKHOUSE_TABLE)
+
+# Safe parameterized queries, built once (single-line to keep the request
+# body and ClickHouse's parse work small)
+_QUERY_RANGE = (
+    "SELECT candle_time, symbol, open, high, low, close, volume "
+    f"FROM {_TABLE} "
+    "WHERE symbol = {symbol:String} "
+    "AND candle_time >= {start:DateTime64(3)} "
+    "AND candle_time <= {end:DateTime64(3)} "
+    "ORDER BY candle_time ASC "
+    "LIMIT {limit:UInt32} OFFSET {offset:UInt32}"
+)
+
+# Keyset page: resumes after the cursor's candle_time instead of using
+# OFFSET, so ClickHouse seeks via the primary key rather than reading and
+# discarding every skipped row
+_QUERY_RANGE_AFTER = (
+    "SELECT candle_time, symbol, open, high, low, close, volume "
+    f"FROM {_TABLE} "
+    "WHERE symbol = {symbol:String} "
+    "AND candle_time >= {start:DateTime64(3)} "
+    "AND candle_time > {after:DateTime64(3)} "
+    "AND candle_time <= {end:DateTime64(3)} "
+    "ORDER BY candle_time ASC "
+    "LIMIT {limit:UInt32}"
+)
+
+_QUERY_LATEST = (
+    "SELECT candle_time, symbol, open, high, low, close, volume "
+    f"FROM {_TABLE} "
+    "WHERE symbol = {symbol:String} "
+    "ORDER BY candle_time DESC "
+    "LIMIT 1"
+)
+
+# Arrow output needs the optional pyarrow dependency
+_ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# /latest response bodies per symbol: symbol -> (expires_at, body).
+# The latest candle only changes once per candle interval, so hot symbols
+# are served from here instead of querying ClickHouse on every request.
+_latest_cache: Dict[str, Tuple[float, bytes]] = {}
+
+# In-flight /latest queries per symbol, so concurrent misses share one query
+_latest_inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+# In-flight range queries per (symbol, start, end, limit, offset, cursor)
+_ohlcv_inflight: Dict[tuple, "asyncio.Future[bytes]"] = {}
+
+
+async def _single_flight(
+    inflight: Dict,
+    key: Hashable,
+    fetch: Callable[[], Awaitable[bytes]]
+) -> bytes:
+    """
+    Run ``fetch()`` at most once per key at a time.
+    
+    Concurrent callers with the same key await the in-flight task instead
+    of starting their own, and share its result or exception. The task is
+    shielded, so one caller disconnecting doesn't cancel it for the rest.
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        inflight[key] = task
+        task.add_done_callback(lambda t: _finish_flight(inflight, key, t))
+    return await asyncio.shield(task)
+
+
+def _finish_flight(
+    inflight: Dict,
+    key: Hashable,
+    task: "asyncio.Future[bytes]"
+) -> None:
+    """Drop a finished task from the in-flight map."""
+    inflight.pop(key, None)
+    if not task.cancelled():
+        # Mark the exception retrieved even if every caller went away
+        task.exception()
+
+
 @router.get(
     "/",
     response_model=OHLCVResponse,
@@ -33,7 +137,10 @@ async def get_ohlcv(
     start: str,
     end: str = None,
     limit: int = 1000,
-    offset: int = 0
+    offset: int = 0,
+    cursor: str = None,
+    format: Literal["json", "arrow"] = "json",
+    db: ClickHouseManager = Depends(get_clickhouse_manager)
 ):
     """
     Get OHLCV data for a symbol in a specified time range (async).
@@ -48,6 +155,10 @@ async def get_ohlcv(
         end: End time in ISO 8601 format or legacy format (optional, defaults to now)
         limit: Maximum number of records (1-10000, default: 1000)
         offset: Number of records to skip for pagination (default: 0)
+        cursor: ``metadata.next_cursor`` of the previous page; resumes
+            right after it (keyset pagination, use instead of offset)
+        format: ``json`` (default) or ``arrow`` for an Arrow IPC stream of
+            the candle columns, without the JSON envelope (bulk clients)
         
     Returns:
         OHLCVResponse containing data array and metadata
@@ -61,13 +172,15 @@ async def get_ohlcv(
     """
     # Validate parameters
     try:
-        params = OHLCVQueryParams(
-            symbol=symbol,
-            start=start,
-            end=end,
-            limit=min(limit, settings.MAX_LIMIT),
-            offset=offset
-        )
+        params = validate_ohlcv_params({
+            "symbol": symbol,
+            "start": start,
+            "end": end,
+            "limit": min(limit, settings.MAX_LIMIT),
+            "offset": offset,
+            "cursor": cursor
+        })
+        after = decode_cursor(cursor) if cursor is not None else None
     except ValueError as e:
         logger.warning(f"Validation error: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
@@ -76,42 +189,56 @@ async def get_ohlcv(
     start_dt = parse_time_param(params.start)
     end_dt = parse_time_param(params.end) if params.end else datetime.utcnow()
     
-    # Build safe parameterized query
-    query = """
-        SELECT 
-            candle_time,
-            symbol,
-            open,
-            high,
-            low,
-            close,
-            volume
-        FROM {table:Identifier}
-        WHERE symbol = {symbol:String}
-          AND candle_time >= {start:DateTime64(3)}
-          AND candle_time <= {end:DateTime64(3)}
-        ORDER BY candle_time ASC
-        LIMIT {limit:UInt32}
-        OFFSET {offset:UInt32}
+    query_parameters = {
+        'symbol': params.symbol,
+        'start': start_dt,
+        'end': end_dt,
+        'limit': params.limit
+    }
+    if after is not None:
+        query = _QUERY_RANGE_AFTER
+        query_parameters['after'] = after
+    else:
+        query = _QUERY_RANGE
+        query_parameters['offset'] = params.offset
+    
+    if format == "arrow":
+        return await _ohlcv_arrow(query, query_parameters, db)
+    
+    # Single-flight: identical concurrent requests share one query
+    key = (
+        params.symbol, params.start, params.end,
+        params.limit, params.offset, params.cursor
+    )
+    body = await _single_flight(
+        _ohlcv_inflight, key,
+        lambda: _fetch_ohlcv(params, query, query_parameters, db)
+    )
+    return Response(content=body, media_type="application/json")
+
+
+async def _timed_query(
+    db: ClickHouseManager,
+    query: str,
+    parameters: Dict,
+    column_oriented: bool = False
+) -> Tuple[Any, float]:
     """
+    Run a query and time it.
     
-    # Get database connection
-    db = ClickHouseManager()
+    Returns:
+        Tuple of (query result, query time in milliseconds)
     
-    # Execute query with timing (async)
-    start_time = time.time()
+    Raises:
+        HTTPException: The database error status if the query fails
+    """
+    start_ns = time.perf_counter_ns()
     
     try:
         result = await db.execute_query_async(
             query,
-            parameters={
-                'table': settings.CLICKHOUSE_TABLE,
-                'symbol': params.symbol,
-                'start': start_dt,
-                'end': end_dt,
-                'limit': params.limit,
-                'offset': params.offset
-            }
+            parameters=parameters,
+            column_oriented=column_oriented
         )
     except DatabaseException as e:
         logger.error(f"Database error: {e.message}")
@@ -120,38 +247,124 @@ async def get_ohlcv(
             detail=e.to_dict()
         )
     
-    query_time = (time.time() - start_time) * 1000
+    return result, (time.perf_counter_ns() - start_ns) / 1_000_000
+
+
+async def _fetch_ohlcv(
+    params: OHLCVQueryParams,
+    query: str,
+    query_parameters: Dict,
+    db: ClickHouseManager
+) -> bytes:
+    """
+    Run the range query and serialize the JSON response body.
+    
+    Raises:
+        HTTPException: The database error status if the query fails
+    """
+    result, query_time = await _timed_query(
+        db, query, query_parameters, column_oriented=True
+    )
     
-    # Transform results to OHLCVData models
+    # Transform results to plain dicts in the OHLCVData shape; rows come
+    # typed from the driver, so per-row model validation is skipped. The
+    # result is column-oriented (the native format's layout), so rows are
+    # zipped from the columns instead of the driver building row tuples.
+    columns = list(result.result_columns)
+    columns[2:] = [_float_column(column) for column in columns[2:]]
     data = [
-        OHLCVData(
-            candle_time=row[0],
-            symbol=row[1],
-            open=float(row[2]),
-            high=float(row[3]),
-            low=float(row[4]),
-            close=float(row[5]),
-            volume=float(row[6])
-        )
-        for row in result.result_rows
+        {
+            "candle_time": candle_time,
+            "symbol": row_symbol,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume
+        }
+        for candle_time, row_symbol, open_, high, low, close, volume
+        in zip(*columns)
     ]
     
+    count = len(data)
+    has_more = count == params.limit
     logger.info(
-        f"Retrieved {len(data)} records for {params.symbol} in {query_time:.2f}ms"
+        f"Retrieved {count} records for {params.symbol} in {query_time:.2f}ms"
     )
     
-    # Build response with metadata
-    return OHLCVResponse(
-        success=True,
-        data=data,
-        metadata=ResponseMetadata(
-            total_records=len(data),
-            limit=params.limit,
-            offset=params.offset,
-            has_more=len(data) == params.limit,
-            query_time_ms=round(query_time, 2),
-            timestamp=datetime.utcnow()
+    # Build response with metadata (serialized directly by orjson;
+    # response_model=OHLCVResponse still documents the shape)
+    return ORJSONResponse({
+        "success": True,
+        "data": data,
+        "metadata": {
+            "total_records": count,
+            "limit": params.limit,
+            "offset": params.offset,
+            "has_more": has_more,
+            "next_cursor": encode_cursor(columns[0][-1]) if has_more else None,
+            "query_time_ms": round(query_time, 2),
+            "timestamp": cached_utc_now()
+        }
+    }).body
+
+
+def _float_column(column: List) -> List:
+    """
+    Return a price/volume column as floats, converting it in one pass.
+    
+    Float64 columns are returned as-is; other numeric types (e.g. Decimal,
+    which orjson cannot serialize) are converted with a single C-level
+    ``map`` instead of a ``float()`` call per cell in the row loop.
+    """
+    if not column or type(column[0]) is float:
+        return column
+    return list(map(float, column))
+
+
+async def _ohlcv_arrow(
+    query: str,
+    query_parameters: Dict,
+    db: ClickHouseManager
+) -> Response:
+    """
+    Run the range query and return it as an Arrow IPC stream.
+    
+    The driver decodes straight into Arrow columns, so no Python-level
+    row loop or JSON encoding happens for these responses.
+    
+    Raises:
+        HTTPException: 400 if pyarrow is not installed, or the database
+            error status if the query fails
+    """
+    if not _ARROW_AVAILABLE:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "Arrow output is not available on this server "
+                "(pyarrow is not installed)"
+            )
+        )
+    
+    import pyarrow
+    import pyarrow.ipc
+    
+    try:
+        table = await db.query_arrow_async(query, parameters=query_parameters)
+    except DatabaseException as e:
+        logger.error(f"Database error: {e.message}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.to_dict()
         )
+    
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    
+    return Response(
+        content=sink.getvalue().to_pybytes(),
+        media_type=ARROW_STREAM_MEDIA_TYPE
     )
 
 
@@ -161,13 +374,20 @@ async def get_ohlcv(
     summary="Get latest candle",
     description="Retrieve the most recent OHLCV candle for a symbol (async)"
 )
-async def get_latest(symbol: str):
+async def get_latest(
+    symbol: str,
+    db: ClickHouseManager = Depends(get_clickhouse_manager)
+):
     """
     Get the latest OHLCV candle for a symbol (async).
     
     Returns data in consistent format with main endpoint, preparing for
     future "latest N candles" feature.
     
+    Bodies are cached per symbol for LATEST_CACHE_TTL seconds and served
+    byte-for-byte, so a cached hit repeats the ``query_time_ms`` and
+    ``timestamp`` of the request that filled the cache.
+    
     Args:
         symbol: Trading symbol (e.g., BINANCE:BTCUSDT.P)
         
@@ -179,94 +399,94 @@ async def get_latest(symbol: str):
     """
     # Validate parameters
     try:
-        params = LatestQueryParams(symbol=symbol)
+        params = validate_latest_params({"symbol": symbol})
     except ValueError as e:
         logger.warning(f"Validation error: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
     
-    # Build safe parameterized query
-    query = """
-        SELECT 
-            candle_time,
-            symbol,
-            open,
-            high,
-            low,
-            close,
-            volume
-        FROM {table:Identifier}
-        WHERE symbol = {symbol:String}
-        ORDER BY candle_time DESC
-        LIMIT 1
-    """
+    ttl = settings.LATEST_CACHE_TTL
+    if ttl <= 0:
+        body = await _fetch_latest(params.symbol, db)
+        return Response(content=body, media_type="application/json")
+    
+    cached = _latest_cache.get(params.symbol)
+    if cached is not None and cached[0] > time.monotonic():
+        return Response(content=cached[1], media_type="application/json")
     
-    # Get database connection
-    db = ClickHouseManager()
+    # Single-flight: the first miss runs the query, concurrent misses for
+    # the same symbol await its result (errors, e.g. 404, are shared too
+    # but never cached)
+    body = await _single_flight(
+        _latest_inflight, params.symbol,
+        lambda: _refresh_latest(params.symbol, db, ttl)
+    )
+    return Response(content=body, media_type="application/json")
 
-    # Execute query with timing
-    start_time = time.time()
+
+async def _refresh_latest(symbol: str, db: ClickHouseManager, ttl: float) -> bytes:
+    """Fetch the latest-candle body for a symbol and cache it."""
+    body = await _fetch_latest(symbol, db)
     
-    try:
-        result = await db.execute_query_async(
-            query,
-            parameters={
-                'table': settings.CLICKHOUSE_TABLE,
-                'symbol': params.symbol
-            }
-        )
-    except DatabaseException as e:
-        logger.error(f"Database error: {e.message}")
-        raise HTTPException(
-            status_code=e.status_code,
-            detail=e.to_dict()
-        )
-    query_time = (time.time() - start_time) * 1000
+    # Dicts keep insertion order, so the first key is the oldest entry
+    _latest_cache.pop(symbol, None)
+    if len(_latest_cache) >= settings.LATEST_CACHE_SIZE:
+        _latest_cache.pop(next(iter(_latest_cache)), None)
+    _latest_cache[symbol] = (time.monotonic() + ttl, body)
+    return body
+
+
+async def _fetch_latest(symbol: str, db: ClickHouseManager) -> bytes:
+    """
+    Query the latest candle for a symbol and serialize the response body.
+    
+    Raises:
+        HTTPException: 404 if the symbol has no data, or the database
+            error status if the query fails
+    """
+    result, query_time = await _timed_query(db, _QUERY_LATEST, {'symbol': symbol})
     
     # Check if data found
     if not result.result_rows:
-        logger.warning(f"No data found for symbol: {params.symbol}")
+        logger.warning(f"No data found for symbol: {symbol}")
         raise HTTPException(
             status_code=404,
             detail={
                 "success": False,
                 "error_code": "DATA_NOT_FOUND",
-                "message": f"No data found for symbol: {params.symbol}",
-                "details": {"symbol": params.symbol}
+                "message": f"No data found for symbol: {symbol}",
+                "details": {"symbol": symbol}
             }
         )
     
     
-    # Transform result to OHLCVData model (as array with single element)
+    # Transform result to a plain dict in the OHLCVData shape (as array
+    # with single element)
     row = result.result_rows[0]
-
     data = [
-        OHLCVData(
-            candle_time=row[0],
-            symbol=row[1],
-            open=float(row[2]),
-            high=float(row[3]),
-            low=float(row[4]),
-            close=float(row[5]),
-            volume=float(row[6])
-        )
+        {
+            "candle_time": row[0],
+            "symbol": row[1],
+            "open": float(row[2]),
+            "high": float(row[3]),
+            "low": float(row[4]),
+            "close": float(row[5]),
+            "volume": float(row[6])
+        }
     ]
-
-
-
-    logger.info(f"Retrieved latest candle for {params.symbol} in {query_time:.2f}ms")
     
-
-    # Build response with metadata (consistent with main endpoint)
-
-    return LatestOHLCVResponse(
-        success=True,
-        data=data,
-        metadata=LatestResponseMetadata(
-            total_records=1,
-            limit=1,
-            offset=0,
-            has_more=False,  # For single latest candle, no more data available
-            query_time_ms=round(query_time, 2),
-            timestamp=datetime.utcnow()
-        )
-    )
+    logger.info(f"Retrieved latest candle for {symbol} in {query_time:.2f}ms")
+    
+    # Build response with metadata (consistent with main endpoint),
+    # serialized once so cached copies can be reused as-is
+    return ORJSONResponse({
+        "success": True,
+        "data": data,
+        "metadata": {
+            "total_records": 1,
+            "limit": 1,
+            "offset": 0,
+            "has_more": False,  # For single latest candle, no more data available
+            "query_time_ms": round(query_time, 2),
+            "timestamp": cached_utc_now()
+        }
+    }).body
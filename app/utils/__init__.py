@@ -11,10 +11,17 @@ from app.utils.time_parser import (
     parse_time_param,
     format_for_clickhouse,
     validate_time_range,
+    cached_utc_now,
+    cached_utc_iso,
 )
+from app.utils.pagination import encode_cursor, decode_cursor
 
 __all__ = [
     "parse_time_param",
     "format_for_clickhouse",
     "validate_time_range",
+    "cached_utc_now",
+    "cached_utc_iso",
+    "encode_cursor",
+    "decode_cursor",
 ]
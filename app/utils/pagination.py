@@ -0,0 +1,46 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor marks the last candle of a page, so the next page is read with
+``candle_time > cursor`` instead of ``OFFSET``; ClickHouse then seeks via
+the primary index rather than reading and discarding every skipped row.
+"""
+
+import base64
+from datetime import datetime
+
+import orjson
+
+
+def encode_cursor(candle_time: datetime) -> str:
+    """
+    Encode the last candle time of a page as an opaque cursor.
+    
+    Args:
+        candle_time: Time of the last candle returned
+    
+    Returns:
+        URL-safe base64 cursor string (unpadded)
+    """
+    payload = orjson.dumps({"t": candle_time.isoformat()})
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> datetime:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+    
+    Args:
+        cursor: Cursor string from ``metadata.next_cursor``
+    
+    Returns:
+        Candle time the next page starts after
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return datetime.fromisoformat(orjson.loads(payload)["t"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from None
@@ -7,28 +7,119 @@ requests and formatting them for ClickHouse queries.
 Supports ISO 8601 format with backward compatibility for legacy format.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 import re
+import time
 
 from app.core.exceptions import InvalidTimeFormatError
 
 
-# ISO 8601 regex pattern
-# Matches: 2025-07-01T00:00:00, 2025-07-01T00:00:00Z, 2025-07-01T00:00:00+03:00, 2025-07-01T00:00:00.000Z
-ISO8601_PATTERN = re.compile(
-    r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?$'
+# Parsed time parameters cached per input string; paginated clients
+# repeat the same start/end values across many requests
+_PARSE_CACHE_SIZE = 4096
+
+# Error details for unrecognized input, built once (invalid input is never
+# cached, so this path runs on every bad request); the expected-format text
+# is InvalidTimeFormatError's default
+_SUPPORTED_FORMATS = (
+    "2025-07-01T00:00:00",
+    "2025-07-01T00:00:00Z",
+    "2025-07-01T00:00:00+03:00",
+    "2025-07-01T00:00:00.000Z",
+    "20250701-0000 (legacy, deprecated)",
 )
 
-# Legacy format pattern (YYYYMMDD-HHmm)
-LEGACY_PATTERN = re.compile(r'^\d{8}-\d{4}$')
+# Shared "now" for response timestamps, refreshed at most once per second
+_now_sec = -1
+_now_dt = datetime.fromtimestamp(0, timezone.utc)
+_now_iso = "1970-01-01T00:00:00Z"
+
+
+def _refresh_now() -> None:
+    """Advance the shared timestamp if the wall-clock second changed."""
+    global _now_sec, _now_dt, _now_iso
+    now = int(time.time())
+    if now != _now_sec:
+        _now_dt = datetime.fromtimestamp(now, timezone.utc)
+        _now_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _now_sec = now
+
+
+def cached_utc_now() -> datetime:
+    """
+    Current UTC time at one-second resolution.
+    
+    Response metadata timestamps are informational, so all requests
+    within the same second share one timezone-aware datetime instead of
+    allocating a new one per response.
+    
+    Returns:
+        Timezone-aware UTC datetime truncated to the second
+    """
+    _refresh_now()
+    return _now_dt
+
+
+def cached_utc_iso() -> str:
+    """
+    Current UTC time as an ISO 8601 string (``...Z``), one-second resolution.
+    
+    String form of ``cached_utc_now()`` for responses built without a
+    serializer; the string is formatted once per second.
+    
+    Returns:
+        UTC timestamp such as ``2025-07-01T00:00:00Z``
+    """
+    _refresh_now()
+    return _now_iso
+
 
+# What may follow the seconds of an ISO 8601 time: 1-6 fractional digits,
+# then "Z" or a "+HH:MM" offset. fromisoformat alone would also accept
+# "+0300", "+03" and longer fractions, which this API never advertised.
+_ISO_SUFFIX_RE = re.compile(r'(?:\.\d{1,6})?(?:Z|[+-]\d{2}:\d{2})?')
 
+
+def is_iso_shape(time_str: str) -> bool:
+    """
+    Shape check for ISO 8601 (YYYY-MM-DDTHH:MM:SS[.ffffff][Z|+HH:MM]).
+    
+    Keeps fromisoformat from accepting forms this API does not advertise
+    (date-only, basic ``YYYYMMDD``, space separator, compact offsets);
+    bad digits in the date and time are still rejected by the parser.
+    """
+    return (
+        len(time_str) >= 19
+        and time_str[10] == 'T'
+        and time_str[4] == '-' and time_str[7] == '-'
+        and time_str[13] == ':' and time_str[16] == ':'
+        and (
+            len(time_str) == 19
+            or _ISO_SUFFIX_RE.fullmatch(time_str, 19) is not None
+        )
+    )
+
+
+def is_legacy_shape(time_str: str) -> bool:
+    """Cheap shape check for the legacy format (YYYYMMDD-HHmm)."""
+    return (
+        len(time_str) == 13
+        and time_str[8] == '-'
+        and time_str[:8].isdigit()
+        and time_str[9:].isdigit()
+    )
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
 def parse_time_param(time_str: str) -> datetime:
     """
     Parse time parameter from request format to datetime.
     
     Supports both ISO 8601 format (recommended) and legacy format.
+    Results are cached per input string (datetimes are immutable, so
+    sharing them is safe); invalid input is not cached.
     
     Supported ISO 8601 formats:
     - 2025-07-01T00:00:00 (basic)
@@ -59,38 +150,10 @@ def parse_time_param(time_str: str) -> datetime:
         datetime(2025, 7, 1, 0, 0)
     """
     # Try ISO 8601 format first (recommended)
-    if ISO8601_PATTERN.match(time_str):
+    if is_iso_shape(time_str):
         try:
-            # Try parsing with different ISO 8601 formats
-            
-            # Format with timezone (Z or offset)
-            if time_str.endswith('Z'):
-                # Remove 'Z' and parse, then make it UTC aware
-                base_str = time_str[:-1]
-                if '.' in base_str:
-                    # With milliseconds: 2025-07-01T00:00:00.000Z
-                    dt = datetime.strptime(base_str, "%Y-%m-%dT%H:%M:%S.%f")
-                else:
-                    # Without milliseconds: 2025-07-01T00:00:00Z
-                    dt = datetime.strptime(base_str, "%Y-%m-%dT%H:%M:%S")
-                # Make it timezone-aware (UTC)
-                from datetime import timezone
-                return dt.replace(tzinfo=timezone.utc)
-            
-            elif '+' in time_str or (time_str.count('-') > 2):
-                # With timezone offset: 2025-07-01T00:00:00+03:00
-                # Use fromisoformat which handles timezone offsets
-                return datetime.fromisoformat(time_str)
-            
-            else:
-                # Basic format without timezone: 2025-07-01T00:00:00
-                if '.' in time_str:
-                    # With milliseconds: 2025-07-01T00:00:00.000
-                    return datetime.strptime(time_str, "%Y-%m-%dT%H:%M:%S.%f")
-                else:
-                    # Standard: 2025-07-01T00:00:00
-                    return datetime.strptime(time_str, "%Y-%m-%dT%H:%M:%S")
-                    
+            # fromisoformat (C) handles fractions, "Z" and offsets
+            return datetime.fromisoformat(time_str)
         except ValueError as e:
             raise InvalidTimeFormatError(
                 message=f"Invalid ISO 8601 time format: {time_str}",
@@ -100,9 +163,16 @@ def parse_time_param(time_str: str) -> datetime:
             )
     
     # Try legacy format (YYYYMMDD-HHmm) - for backward compatibility
-    elif LEGACY_PATTERN.match(time_str):
+    elif is_legacy_shape(time_str):
         try:
-            return datetime.strptime(time_str, "%Y%m%d-%H%M")
+            # Fixed-width digits, so build the datetime directly
+            return datetime(
+                int(time_str[0:4]),
+                int(time_str[4:6]),
+                int(time_str[6:8]),
+                int(time_str[9:11]),
+                int(time_str[11:13])
+            )
         except ValueError as e:
             raise InvalidTimeFormatError(
                 message=f"Invalid legacy time format: {time_str}",
@@ -116,19 +186,23 @@ def parse_time_param(time_str: str) -> datetime:
         raise InvalidTimeFormatError(
             message=f"Invalid time format: {time_str}",
             provided=time_str,
-            expected="ISO 8601 format (e.g., 2025-07-01T00:00:00Z) or legacy format (YYYYMMDD-HHmm)",
-            details={
-                "supported_formats": [
-                    "2025-07-01T00:00:00",
-                    "2025-07-01T00:00:00Z",
-                    "2025-07-01T00:00:00+03:00",
-                    "2025-07-01T00:00:00.000Z",
-                    "20250701-0000 (legacy, deprecated)"
-                ]
-            }
+            details={"supported_formats": _SUPPORTED_FORMATS}
         )
 
 
+def parse_time_naive(time_str: str) -> datetime:
+    """
+    Parse a time parameter as naive wall-clock time.
+    
+    Any offset is dropped, not converted; used to order ``start``/``end``
+    as written. Shares ``parse_time_param``'s cache.
+    
+    Raises:
+        InvalidTimeFormatError: If time format is invalid
+    """
+    return parse_time_param(time_str).replace(tzinfo=None)
+
+
 def format_for_clickhouse(dt: datetime) -> str:
     """
     Format datetime for ClickHouse query.
@@ -155,10 +229,10 @@ def format_for_clickhouse(dt: datetime) -> str:
     """
     # If datetime is timezone-aware, convert to UTC
     if dt.tzinfo is not None:
-        from datetime import timezone
         dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
     
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    # isoformat (C) avoids strftime's format-string parsing
+    return dt.isoformat(sep=" ", timespec="seconds")
 
 
 def validate_time_range(
@@ -169,7 +243,8 @@ def validate_time_range(
     Validate that time range is logical.
     
     Handles both timezone-aware and naive datetimes.
-    If both datetimes have timezones, they are compared after converting to UTC.
+    Aware datetimes are compared as absolute times; a naive datetime
+    paired with an aware one is treated as UTC.
     
     Args:
         start: Start datetime (can be timezone-aware or naive)
@@ -196,14 +271,17 @@ def validate_time_range(
     if end is None:
         return True
     
-    # Convert both to UTC if they are timezone-aware for comparison
+    # Aware datetimes compare by absolute time directly; when only one
+    # side is aware, the naive one is taken as UTC (legacy inputs carry
+    # no zone)
     compare_start = start
     compare_end = end
     
-    if start.tzinfo is not None and end.tzinfo is not None:
-        from datetime import timezone
-        compare_start = start.astimezone(timezone.utc)
-        compare_end = end.astimezone(timezone.utc)
+    if (start.tzinfo is None) != (end.tzinfo is None):
+        if start.tzinfo is None:
+            compare_start = start.replace(tzinfo=timezone.utc)
+        else:
+            compare_end = end.replace(tzinfo=timezone.utc)
     
     if compare_end <= compare_start:
         raise ValueError(
@@ -4,77 +4,123 @@ Pytest configuration and fixtures.
 This module provides shared fixtures for testing the API.
 """
 
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, MagicMock
 from datetime import datetime
+from types import SimpleNamespace
 
 from app.main import app
-from app.core.database import ClickHouseManager
+from app.core.database import get_clickhouse_manager
+from app.routers import health, ohlcv
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
     """
     Create a test client for the FastAPI application.
     
+    The client holds no per-test state (dependencies are overridden on
+    the app), so one instance is shared by the whole session.
+    
     Returns:
         TestClient instance
     """
     return TestClient(app)
 
 
+class _StubClickHouseManager:
+    """
+    In-memory stand-in for ClickHouseManager.
+    
+    Tests configure it by assigning ``health`` and ``result`` or by
+    replacing a method with a ``Mock``; the async methods delegate to the
+    sync ones, so overriding ``execute_query`` covers both.
+    """
+    
+    def __init__(self):
+        self._client = object()
+        self.is_connected = True
+        self.health = {
+            "status": "up",
+            "response_time_ms": 10.5,
+            "database": "default"
+        }
+        self.result = SimpleNamespace(result_rows=[], result_columns=[], row_count=0)
+    
+    def connect(self):
+        pass
+    
+    async def connect_async(self):
+        self.is_connected = True
+    
+    def get_client(self):
+        return self._client
+    
+    def health_check(self):
+        return self.health
+    
+    async def health_check_async(self):
+        return self.health_check()
+    
+    def execute_query(self, query, parameters=None, column_oriented=False):
+        return self.result
+    
+    async def execute_query_async(
+        self,
+        query,
+        parameters=None,
+        column_oriented=False,
+    ):
+        return self.execute_query(query, parameters, column_oriented)
+
+
 @pytest.fixture
-def mock_db(monkeypatch):
+def mock_db():
     """
-    Create a mock database manager for testing.
+    Create a stub database manager for testing.
     
-    This fixture mocks the ClickHouseManager to avoid actual
-    database connections during tests.
+    This fixture replaces the ClickHouseManager dependency to avoid
+    actual database connections during tests.
     
     Returns:
-        Mock ClickHouseManager instance
+        _StubClickHouseManager instance
     """
-    mock_manager = Mock(spec=ClickHouseManager)
-    
-    # Mock connect method
-    mock_manager.connect = Mock(return_value=None)
+    stub_manager = _StubClickHouseManager()
     
-    # Mock get_client method
-    mock_manager.get_client = Mock(return_value=Mock())
+    # Override the manager dependency for all routes
+    app.dependency_overrides[get_clickhouse_manager] = lambda: stub_manager
     
-    # Mock health_check method
-    mock_manager.health_check = Mock(return_value={
-        "status": "up",
-        "response_time_ms": 10.5,
-        "database": "default"
-    })
+    yield stub_manager
     
-    # Patch the ClickHouseManager class
-    monkeypatch.setattr(
-        "app.core.database.ClickHouseManager.__new__",
-        lambda cls: mock_manager
-    )
+    app.dependency_overrides.pop(get_clickhouse_manager, None)
+
+
+@pytest.fixture(autouse=True)
+def reset_router_caches():
+    """
+    Clear module-level router caches around every test.
     
-    return mock_manager
+    The /latest cache, single-flight maps and cached database health would
+    otherwise leak responses from one test (and stub manager) into the next.
+    """
+    yield
+    ohlcv._latest_cache.clear()
+    ohlcv._latest_inflight.clear()
+    ohlcv._ohlcv_inflight.clear()
+    health._db_health = None
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ohlcv_data():
     """
     Sample OHLCV data for testing.
     
+    Immutable, so one instance is shared by the whole session.
+    
     Returns:
-        List of tuples representing OHLCV records
+        Tuple of tuples representing OHLCV records
     """
-    return [
+    return (
         (
             datetime(2025, 7, 1, 0, 0, 0),
             "BINANCE:BTCUSDT.P",
@@ -93,23 +139,25 @@ def sample_ohlcv_data():
             50600.0,
             987654.32
         ),
-    ]
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_query_result(sample_ohlcv_data):
     """
-    Create a mock query result object.
+    Create a fake query result object, shared by the whole session.
     
     Args:
         sample_ohlcv_data: Sample data fixture
         
     Returns:
-        Mock query result with result_rows
+        Result with result_rows, result_columns and row_count
     """
-    mock_result = MagicMock()
-    mock_result.result_rows = sample_ohlcv_data
-    return mock_result
+    return SimpleNamespace(
+        result_rows=sample_ohlcv_data,
+        result_columns=tuple(zip(*sample_ohlcv_data)),
+        row_count=len(sample_ohlcv_data)
+    )
 
 
 @pytest.fixture
@@ -0,0 +1,96 @@
+"""
+Tests for ClickHouse connection management.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.core.database import ClickHouseManager
+from app.core.exceptions import ConnectionError
+
+
+@pytest.fixture
+def failing_get_client(monkeypatch):
+    """Patch clickhouse_connect.get_client to always fail."""
+    get_client = Mock(side_effect=OSError("Connection refused"))
+    monkeypatch.setattr("clickhouse_connect.get_client", get_client)
+    return get_client
+
+
+def test_connect_failure_raises_connection_error(failing_get_client):
+    """Test that a failed connect raises ConnectionError with details."""
+    manager = ClickHouseManager()
+
+    with pytest.raises(ConnectionError) as exc_info:
+        manager.connect()
+
+    assert "Connection refused" in exc_info.value.message
+    assert "host" in exc_info.value.details
+    assert manager._client is None
+
+
+def test_connect_fails_fast_during_cooldown(failing_get_client):
+    """Test that reconnects inside the cooldown window skip the socket."""
+    manager = ClickHouseManager()
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            manager.connect()
+
+    # Only the first attempt should have reached the driver
+    assert failing_get_client.call_count == 1
+
+
+def test_connect_retries_after_cooldown(failing_get_client):
+    """Test that a new attempt is made once the cooldown has elapsed."""
+    manager = ClickHouseManager()
+
+    with pytest.raises(ConnectionError):
+        manager.connect()
+
+    # Pretend the failure happened long ago
+    manager._last_failure_ts -= 60
+
+    with pytest.raises(ConnectionError):
+        manager.connect()
+
+    assert failing_get_client.call_count == 2
+
+
+def test_concurrent_async_connects_share_one_client(monkeypatch):
+    """Test that concurrent cold-start connects create a single client."""
+    async def slow_get_async_client(**kwargs):
+        await asyncio.sleep(0.01)
+        return AsyncMock()
+
+    get_async_client = AsyncMock(side_effect=slow_get_async_client)
+    monkeypatch.setattr("clickhouse_connect.get_async_client", get_async_client)
+    manager = ClickHouseManager()
+
+    async def run():
+        return await asyncio.gather(
+            *(manager.get_async_client() for _ in range(5))
+        )
+
+    clients = asyncio.run(run())
+
+    assert get_async_client.await_count == 1
+    assert all(client is clients[0] for client in clients)
+
+
+def test_async_connect_closes_client_when_test_query_fails(monkeypatch):
+    """Test that a client whose test query fails is closed, not leaked."""
+    client = AsyncMock()
+    client.command.side_effect = OSError("Connection reset")
+    monkeypatch.setattr(
+        "clickhouse_connect.get_async_client", AsyncMock(return_value=client)
+    )
+    manager = ClickHouseManager()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(manager.connect_async())
+
+    client.close.assert_awaited_once()
+    assert manager.is_connected is False
@@ -2,18 +2,25 @@
 Tests for health check endpoints.
 """
 
+import asyncio
+
 import pytest
 from fastapi import status
+from unittest.mock import AsyncMock
+
+from app.routers.health import db_health_monitor
 
 
-def test_basic_health_check(client):
+def test_basic_health_check(client, mock_db):
     """Test basic health check endpoint."""
     response = client.get("/health")
     
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     
+    assert data["success"] is True
     assert data["status"] == "healthy"
+    assert data["database"]["connected"] is True
     assert "version" in data
     assert "timestamp" in data
 
@@ -25,27 +32,39 @@ def test_readiness_check_healthy(client, mock_db):
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     
-    assert data["status"] == "healthy"
-    assert "checks" in data
-    assert "database" in data["checks"]
-    assert data["checks"]["database"]["status"] == "up"
+    assert data["success"] is True
+    assert data["ready"] is True
 
 
 def test_readiness_check_unhealthy(client, mock_db):
     """Test readiness check when database is unhealthy."""
     # Mock unhealthy database
-    mock_db.health_check.return_value = {
+    mock_db.health = {
         "status": "down",
         "error": "Connection refused"
     }
     
     response = client.get("/health/ready")
     
-    assert response.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    data = response.json()
+    
+    assert data["success"] is False
+    assert data["ready"] is False
+    assert data["reason"] == "Database connection unhealthy"
+
+
+def test_health_check_ping_timeout(client, mock_db):
+    """Test that a timed-out database ping reports unhealthy with 503."""
+    mock_db.health_check_async = AsyncMock(side_effect=asyncio.TimeoutError)
+    
+    response = client.get("/health")
+    
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
     data = response.json()
     
     assert data["status"] == "unhealthy"
-    assert data["checks"]["database"]["status"] == "down"
+    assert "timed out" in data["database"]["error"]
 
 
 def test_liveness_check(client):
@@ -55,7 +74,9 @@ def test_liveness_check(client):
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     
-    assert data["status"] == "ok"
+    assert data["success"] is True
+    assert data["alive"] is True
+    assert "timestamp" in data
 
 
 def test_health_check_has_correct_structure(client):
@@ -73,9 +94,43 @@ def test_readiness_check_has_correct_structure(client, mock_db):
     response = client.get("/health/ready")
     data = response.json()
     
-    required_fields = ["status", "version", "timestamp", "checks"]
+    required_fields = ["success", "ready", "timestamp"]
     for field in required_fields:
         assert field in data, f"Missing required field: {field}"
+
+
+def test_readiness_check_not_connected(client, mock_db):
+    """Test readiness check before the database client is created."""
+    mock_db.is_connected = False
+    
+    response = client.get("/health/ready")
+    
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    data = response.json()
+    
+    assert data["ready"] is False
+    assert data["reason"] == "Database not initialized"
+
+
+def test_readiness_recovers_after_monitor_reconnects(client, mock_db):
+    """Test that the health monitor reconnects a manager left disconnected."""
+    mock_db.is_connected = False
+    assert client.get("/health/ready").status_code == 503
+    
+    # One monitor tick, then cancelled while it sleeps until the next
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(db_health_monitor(mock_db), timeout=0.05))
+    
+    response = client.get("/health/ready")
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["ready"] is True
+
+
+def test_health_check_has_request_id(client):
+    """Test that responses carry a 32-character hex request ID."""
+    response = client.get("/health/live")
+    request_id = response.headers["x-request-id"]
     
-    assert "database" in data["checks"]
-    assert "api" in data["checks"]
+    assert len(request_id) == 32
+    int(request_id, 16)
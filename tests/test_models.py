@@ -12,82 +12,50 @@ from app.models.request import OHLCVQueryParams, LatestQueryParams, MultiSymbolQ
 from app.models.response import OHLCVData, ResponseMetadata, OHLCVResponse
 
 
+# Shared test inputs, built once at import
+_SYMBOLS_100 = tuple(f"SYMBOL{i}" for i in range(100))
+_SYMBOLS_101 = _SYMBOLS_100 + ("SYMBOL100",)
+
+_OHLCV_SAMPLES_5 = tuple(
+    OHLCVData(
+        candle_time=datetime(2025, 7, 1, i, 0),
+        symbol="TEST",
+        open=100.0 + i,
+        high=110.0 + i,
+        low=90.0 + i,
+        close=105.0 + i,
+        volume=1000.0
+    )
+    for i in range(5)
+)
+
 class TestOHLCVQueryParams:
     """Tests for OHLCVQueryParams model."""
     
     # ============================================================================
-    # ISO 8601 Format Tests
-    # ============================================================================
-    
-    def test_valid_params_iso8601_utc(self):
-        """Test creation with valid ISO 8601 UTC parameters."""
-        params = OHLCVQueryParams(
-            symbol="BINANCE:BTCUSDT.P",
-            start="2025-07-01T00:00:00Z",
-            end="2025-08-01T00:00:00Z",
-            limit=1000,
-            offset=0
-        )
-        
-        assert params.symbol == "BINANCE:BTCUSDT.P"
-        assert params.start == "2025-07-01T00:00:00Z"
-        assert params.end == "2025-08-01T00:00:00Z"
-        assert params.limit == 1000
-        assert params.offset == 0
-    
-    def test_valid_params_iso8601_basic(self):
-        """Test creation with basic ISO 8601 format (no timezone)."""
-        params = OHLCVQueryParams(
-            symbol="BINANCE:BTCUSDT.P",
-            start="2025-07-01T00:00:00",
-            end="2025-08-01T00:00:00",
-            limit=1000
-        )
-        
-        assert params.start == "2025-07-01T00:00:00"
-        assert params.end == "2025-08-01T00:00:00"
-    
-    def test_valid_params_iso8601_timezone_offset(self):
-        """Test creation with ISO 8601 timezone offset."""
-        params = OHLCVQueryParams(
-            symbol="BINANCE:BTCUSDT.P",
-            start="2025-07-01T00:00:00+03:00",
-            end="2025-08-01T00:00:00+03:00",
-            limit=1000
-        )
-        
-        assert params.start == "2025-07-01T00:00:00+03:00"
-        assert params.end == "2025-08-01T00:00:00+03:00"
-    
-    def test_valid_params_iso8601_milliseconds(self):
-        """Test creation with ISO 8601 milliseconds."""
-        params = OHLCVQueryParams(
-            symbol="BINANCE:BTCUSDT.P",
-            start="2025-07-01T00:00:00.000Z",
-            end="2025-08-01T23:59:59.999Z",
-            limit=1000
-        )
-        
-        assert params.start == "2025-07-01T00:00:00.000Z"
-        assert params.end == "2025-08-01T23:59:59.999Z"
-    
-    # ============================================================================
-    # Legacy Format Tests (Backward Compatibility)
+    # Valid Format Tests (ISO 8601 and legacy)
     # ============================================================================
     
-    def test_valid_params_legacy_format(self):
-        """Test creation with legacy format (backward compatibility)."""
+    @pytest.mark.parametrize("start,end", [
+        ("2025-07-01T00:00:00Z", "2025-08-01T00:00:00Z"),            # UTC
+        ("2025-07-01T00:00:00", "2025-08-01T00:00:00"),              # No timezone
+        ("2025-07-01T00:00:00+03:00", "2025-08-01T00:00:00+03:00"),  # Offset
+        ("2025-07-01T00:00:00.000Z", "2025-08-01T23:59:59.999Z"),    # Milliseconds
+        ("20250701-0000", "20250801-0000"),                          # Legacy
+    ])
+    def test_valid_time_formats(self, start, end):
+        """Test creation with each supported time format."""
         params = OHLCVQueryParams(
             symbol="BINANCE:BTCUSDT.P",
-            start="20250701-0000",
-            end="20250801-0000",
+            start=start,
+            end=end,
             limit=1000,
             offset=0
         )
         
         assert params.symbol == "BINANCE:BTCUSDT.P"
-        assert params.start == "20250701-0000"
-        assert params.end == "20250801-0000"
+        assert params.start == start
+        assert params.end == end
         assert params.limit == 1000
         assert params.offset == 0
     
@@ -107,34 +75,38 @@ class TestOHLCVQueryParams:
     # Invalid Format Tests
     # ============================================================================
     
-    def test_invalid_time_format_iso8601(self):
-        """Test that invalid ISO 8601 format raises error."""
+    @pytest.mark.parametrize("start", [
+        "invalid-time",
+        "2025-07-01",           # Missing time part
+        "2025/07/01T00:00:00",  # Wrong separator
+    ])
+    def test_invalid_time_formats(self, start):
+        """Test that unsupported time formats raise an error."""
         with pytest.raises(ValidationError) as exc_info:
             OHLCVQueryParams(
                 symbol="BINANCE:BTCUSDT.P",
-                start="invalid-time",
+                start=start,
                 end="2025-08-01T00:00:00Z"
             )
         
         errors = exc_info.value.errors()
         assert any("Invalid time format" in str(e) for e in errors)
     
-    def test_invalid_time_format_incomplete(self):
-        """Test that incomplete time format raises error."""
+    def test_params_are_immutable(self):
+        """Test that validated params cannot be modified or extended."""
+        params = OHLCVQueryParams(
+            symbol="BINANCE:BTCUSDT.P",
+            start="2025-07-01T00:00:00Z"
+        )
+        
         with pytest.raises(ValidationError):
-            OHLCVQueryParams(
-                symbol="BINANCE:BTCUSDT.P",
-                start="2025-07-01",  # Missing time part
-                end="2025-08-01T00:00:00Z"
-            )
-    
-    def test_invalid_time_format_wrong_separator(self):
-        """Test that wrong separator raises error."""
+            params.limit = 5
+        
         with pytest.raises(ValidationError):
             OHLCVQueryParams(
                 symbol="BINANCE:BTCUSDT.P",
-                start="2025/07/01T00:00:00",  # Wrong separator
-                end="2025-08-01T00:00:00Z"
+                start="2025-07-01T00:00:00Z",
+                unknown="value"
             )
     
     # ============================================================================
@@ -347,18 +319,16 @@ class TestMultiSymbolQueryParams:
     def test_max_symbols_validation(self):
         """Test maximum symbols validation."""
         # 100 symbols (max)
-        symbols = [f"SYMBOL{i}" for i in range(100)]
         params = MultiSymbolQueryParams(
-            symbols=symbols,
+            symbols=list(_SYMBOLS_100),
             start="2025-07-01T00:00:00Z"
         )
         assert len(params.symbols) == 100
         
         # 101 symbols should fail
-        symbols_too_many = [f"SYMBOL{i}" for i in range(101)]
         with pytest.raises(ValidationError):
             MultiSymbolQueryParams(
-                symbols=symbols_too_many,
+                symbols=list(_SYMBOLS_101),
                 start="2025-07-01T00:00:00Z"
             )
 
@@ -454,8 +424,8 @@ class TestResponseMetadata:
         )
         
         # Timestamp should be recent (within last second)
-        from datetime import datetime, timedelta
-        now = datetime.utcnow()
+        from datetime import datetime, timedelta, timezone
+        now = datetime.now(timezone.utc)
         assert (now - metadata.timestamp) < timedelta(seconds=1)
 
 
@@ -516,19 +486,6 @@ class TestOHLCVResponse:
     
     def test_multiple_records_response(self):
         """Test response with multiple data records."""
-        data = [
-            OHLCVData(
-                candle_time=datetime(2025, 7, 1, i, 0),
-                symbol="TEST",
-                open=100.0 + i,
-                high=110.0 + i,
-                low=90.0 + i,
-                close=105.0 + i,
-                volume=1000.0
-            )
-            for i in range(5)
-        ]
-        
         metadata = ResponseMetadata(
             total_records=5,
             limit=1000,
@@ -539,7 +496,7 @@ class TestOHLCVResponse:
         
         response = OHLCVResponse(
             success=True,
-            data=data,
+            data=list(_OHLCV_SAMPLES_5),
             metadata=metadata
         )
         
@@ -4,9 +4,13 @@ Tests for OHLCV data endpoints.
 Updated to test ISO 8601 format support with backward compatibility.
 """
 
+import asyncio
+from datetime import datetime
+
 import pytest
 from fastapi import status
-from unittest.mock import Mock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 
 # ============================================================================
@@ -15,8 +19,8 @@ from unittest.mock import Mock
 
 def test_get_ohlcv_success_iso8601(client, mock_db, mock_query_result):
     """Test successful OHLCV data retrieval with ISO 8601 format."""
-    # Mock execute_query to return sample data
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    # Serve sample data from the stub database
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -39,7 +43,7 @@ def test_get_ohlcv_success_iso8601(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_success_iso8601_timezone_offset(client, mock_db, mock_query_result):
     """Test successful OHLCV data retrieval with ISO 8601 timezone offset."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -58,7 +62,7 @@ def test_get_ohlcv_success_iso8601_timezone_offset(client, mock_db, mock_query_r
 
 def test_get_ohlcv_success_iso8601_basic(client, mock_db, mock_query_result):
     """Test successful OHLCV data retrieval with basic ISO 8601 format."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -81,7 +85,7 @@ def test_get_ohlcv_success_iso8601_basic(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_success_legacy_format(client, mock_db, mock_query_result):
     """Test successful OHLCV data retrieval with legacy format."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -103,7 +107,7 @@ def test_get_ohlcv_success_legacy_format(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_mixed_formats(client, mock_db, mock_query_result):
     """Test OHLCV with mixed ISO 8601 and legacy formats."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -196,7 +200,7 @@ def test_get_ohlcv_missing_start(client):
 
 def test_get_ohlcv_pagination_iso8601(client, mock_db, mock_query_result):
     """Test OHLCV endpoint pagination with ISO 8601."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -218,7 +222,7 @@ def test_get_ohlcv_pagination_iso8601(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_pagination_legacy(client, mock_db, mock_query_result):
     """Test OHLCV endpoint pagination with legacy format."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -240,7 +244,7 @@ def test_get_ohlcv_pagination_legacy(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_max_limit(client, mock_db, mock_query_result):
     """Test that limit is capped at MAX_LIMIT."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -265,7 +269,7 @@ def test_get_ohlcv_max_limit(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_response_structure(client, mock_db, mock_query_result):
     """Test that OHLCV response has correct structure."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -295,7 +299,7 @@ def test_get_ohlcv_response_structure(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_data_structure(client, mock_db, mock_query_result):
     """Test that OHLCV data records have correct structure."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -320,7 +324,7 @@ def test_get_ohlcv_data_structure(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_timestamp_format(client, mock_db, mock_query_result):
     """Test that timestamps in response are in ISO 8601 format."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -341,13 +345,124 @@ def test_get_ohlcv_timestamp_format(client, mock_db, mock_query_result):
         assert "T" in data["data"][0]["candle_time"]  # ISO 8601 format
 
 
+def test_get_ohlcv_error_timestamp_is_utc(client, mock_db):
+    """Test that database error bodies carry a UTC ("Z") timestamp."""
+    from app.core.exceptions import QueryError
+    
+    mock_db.execute_query_async = AsyncMock(side_effect=QueryError("boom"))
+    
+    response = client.get(
+        "/api/v1/ohlcv",
+        params={"symbol": "BINANCE:BTCUSDT.P", "start": "2025-07-01T00:00:00Z"}
+    )
+    
+    assert response.status_code == QueryError.status_code
+    assert response.json()["detail"]["timestamp"].endswith("Z")
+
+
+def test_get_ohlcv_arrow_requires_pyarrow(client, mock_db, monkeypatch):
+    """Test Arrow output is rejected when pyarrow is not installed."""
+    monkeypatch.setattr("app.routers.ohlcv._ARROW_AVAILABLE", False)
+    
+    response = client.get(
+        "/api/v1/ohlcv/",
+        params={
+            "symbol": "BINANCE:BTCUSDT.P",
+            "start": "2025-07-01T00:00:00Z",
+            "format": "arrow"
+        }
+    )
+    
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_ohlcv_invalid_output_format(client):
+    """Test unknown output format is rejected."""
+    response = client.get(
+        "/api/v1/ohlcv/",
+        params={
+            "symbol": "BINANCE:BTCUSDT.P",
+            "start": "2025-07-01T00:00:00Z",
+            "format": "csv"
+        }
+    )
+    
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_single_flight_shares_concurrent_fetch():
+    """Test concurrent identical requests run the fetch only once."""
+    from app.routers.ohlcv import _single_flight
+    
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"body"
+    
+    async def run():
+        inflight = {}
+        results = await asyncio.gather(
+            *(_single_flight(inflight, "key", fetch) for _ in range(5))
+        )
+        return results, inflight
+    
+    results, inflight = asyncio.run(run())
+    
+    assert results == [b"body"] * 5
+    assert len(calls) == 1
+    assert inflight == {}
+
+
+def test_get_ohlcv_cursor_pagination(
+    client, mock_db, mock_query_result, sample_ohlcv_data
+):
+    """Test that next_cursor resumes after the last row without OFFSET."""
+    from app.utils.pagination import decode_cursor
+    
+    mock_db.execute_query_async = AsyncMock(return_value=mock_query_result)
+    params = {
+        "symbol": "BINANCE:BTCUSDT.P",
+        "start": "2025-07-01T00:00:00Z",
+        "end": "2025-08-01T00:00:00Z",
+        "limit": 2
+    }
+    
+    first = client.get("/api/v1/ohlcv", params=params).json()
+    cursor = first["metadata"]["next_cursor"]
+    assert decode_cursor(cursor) == sample_ohlcv_data[-1][0]
+    
+    response = client.get("/api/v1/ohlcv", params={**params, "cursor": cursor})
+    
+    assert response.status_code == status.HTTP_200_OK
+    query = mock_db.execute_query_async.await_args.args[0]
+    parameters = mock_db.execute_query_async.await_args.kwargs["parameters"]
+    assert "OFFSET" not in query
+    assert parameters["after"] == sample_ohlcv_data[-1][0]
+
+
+@pytest.mark.parametrize("extra", [
+    {"cursor": "not-a-cursor"},
+    {"cursor": "eyJ0IjogIjIwMjUtMDctMDFUMDA6MDE6MDAifQ", "offset": 5},
+])
+def test_get_ohlcv_invalid_cursor(client, mock_db, extra):
+    """Test that malformed cursors, or cursor plus offset, are rejected."""
+    response = client.get(
+        "/api/v1/ohlcv",
+        params={"symbol": "BINANCE:BTCUSDT.P", "start": "2025-07-01T00:00:00Z", **extra}
+    )
+    
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 # ============================================================================
 # Latest Endpoint Tests
 # ============================================================================
 
 def test_get_latest_success(client, mock_db, mock_query_result):
     """Test successful latest candle retrieval."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv/latest",
@@ -366,7 +481,7 @@ def test_get_latest_success(client, mock_db, mock_query_result):
 
 def test_get_latest_response_structure(client, mock_db, mock_query_result):
     """Test latest endpoint response structure."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv/latest",
@@ -391,9 +506,7 @@ def test_get_latest_response_structure(client, mock_db, mock_query_result):
 def test_get_latest_not_found(client, mock_db):
     """Test latest candle endpoint when no data found."""
     # Mock empty result
-    mock_result = Mock()
-    mock_result.result_rows = []
-    mock_db.execute_query = Mock(return_value=mock_result)
+    mock_db.result = SimpleNamespace(result_rows=[], result_columns=[], row_count=0)
     
     response = client.get(
         "/api/v1/ohlcv/latest",
@@ -407,6 +520,21 @@ def test_get_latest_not_found(client, mock_db):
     assert data["error_code"] == "DATA_NOT_FOUND"
 
 
+def test_get_latest_cached_per_symbol(client, mock_db, mock_query_result):
+    """Test repeated latest requests for a symbol share one query."""
+    mock_db.execute_query_async = AsyncMock(return_value=mock_query_result)
+    
+    for _ in range(3):
+        response = client.get(
+            "/api/v1/ohlcv/latest",
+            params={"symbol": "BINANCE:BTCUSDT.P"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]) == 1
+    
+    assert mock_db.execute_query_async.await_count == 1
+
+
 def test_get_latest_missing_symbol(client):
     """Test latest endpoint with missing symbol parameter."""
     response = client.get("/api/v1/ohlcv/latest")
@@ -420,7 +548,7 @@ def test_get_latest_missing_symbol(client):
 
 def test_get_ohlcv_without_end_time_iso8601(client, mock_db, mock_query_result):
     """Test OHLCV endpoint without end time (defaults to now) - ISO 8601."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -436,7 +564,7 @@ def test_get_ohlcv_without_end_time_iso8601(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_without_end_time_legacy(client, mock_db, mock_query_result):
     """Test OHLCV endpoint without end time - legacy format."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -467,13 +595,25 @@ def test_root_endpoint(client):
     assert "endpoints" in data
 
 
+def test_openapi_lists_root_path_as_server():
+    """Test that the OpenAPI schema honours the ASGI root_path."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    
+    plain = TestClient(app).get("/openapi.json").json()
+    proxied = TestClient(app, root_path="/proxy").get("/openapi.json").json()
+    
+    assert "servers" not in plain
+    assert proxied["servers"][0] == {"url": "/proxy"}
+
+
 # ============================================================================
 # Edge Cases Tests
 # ============================================================================
 
 def test_get_ohlcv_with_milliseconds(client, mock_db, mock_query_result):
     """Test OHLCV with ISO 8601 milliseconds format."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -492,7 +632,7 @@ def test_get_ohlcv_with_milliseconds(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_zero_offset(client, mock_db, mock_query_result):
     """Test OHLCV with zero offset."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -511,7 +651,7 @@ def test_get_ohlcv_zero_offset(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_minimum_limit(client, mock_db, mock_query_result):
     """Test OHLCV with minimum limit (1)."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -530,7 +670,7 @@ def test_get_ohlcv_minimum_limit(client, mock_db, mock_query_result):
 
 def test_get_ohlcv_special_symbols(client, mock_db, mock_query_result):
     """Test OHLCV with special symbol characters."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -551,9 +691,12 @@ def test_get_ohlcv_special_symbols(client, mock_db, mock_query_result):
 def test_get_ohlcv_metadata_has_more_true(client, mock_db):
     """Test has_more flag when there's more data available."""
     # Create a result with exactly limit records
-    mock_result = Mock()
-    mock_result.result_rows = [(None, None, 1.0, 1.0, 1.0, 1.0, 1.0)] * 100
-    mock_db.execute_query = Mock(return_value=mock_result)
+    rows = [(datetime(2025, 7, 1), "BINANCE:BTCUSDT.P", 1.0, 1.0, 1.0, 1.0, 1.0)] * 100
+    mock_db.result = SimpleNamespace(
+        result_rows=rows,
+        result_columns=[list(column) for column in zip(*rows)],
+        row_count=len(rows)
+    )
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -570,14 +713,18 @@ def test_get_ohlcv_metadata_has_more_true(client, mock_db):
     
     # When we get exactly limit records, has_more should be True
     assert data["metadata"]["has_more"] is True
+    assert data["metadata"]["next_cursor"] is not None
 
 
 def test_get_ohlcv_metadata_has_more_false(client, mock_db):
     """Test has_more flag when there's no more data."""
     # Create a result with fewer than limit records
-    mock_result = Mock()
-    mock_result.result_rows = [(None, None, 1.0, 1.0, 1.0, 1.0, 1.0)] * 50
-    mock_db.execute_query = Mock(return_value=mock_result)
+    rows = [(None, None, 1.0, 1.0, 1.0, 1.0, 1.0)] * 50
+    mock_db.result = SimpleNamespace(
+        result_rows=rows,
+        result_columns=[list(column) for column in zip(*rows)],
+        row_count=len(rows)
+    )
     
     response = client.get(
         "/api/v1/ohlcv",
@@ -598,7 +745,7 @@ def test_get_ohlcv_metadata_has_more_false(client, mock_db):
 
 def test_get_ohlcv_query_time_present(client, mock_db, mock_query_result):
     """Test that query_time_ms is present in metadata."""
-    mock_db.execute_query = Mock(return_value=mock_query_result)
+    mock_db.result = mock_query_result
     
     response = client.get(
         "/api/v1/ohlcv",
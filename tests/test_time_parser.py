@@ -197,6 +197,9 @@ class TestParseTimeParam:
             "2025/07/01-0000",      # Wrong date separator
             "01-07-2025T00:00:00",  # Wrong date order
             "2025-7-1T00:00:00",    # Missing leading zeros
+            "2025-07-01T00:00:00+0300",     # Offset without colon
+            "2025-07-01T00:00:00+03",       # Hour-only offset
+            "2025-07-01T00:00:00.1234567",  # More than 6 fractional digits
         ]
         
         for invalid_format in invalid_formats: